@@ -7,10 +7,8 @@ Pure CLI версия QUANTUM-PCI Monitor без GUI зависимостей
 import os
 import sys
 import time
-import json
 import signal
-import subprocess
-import argparse
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Any
@@ -35,6 +33,7 @@ def timeout(duration):
 
 def safe_run_command(command, timeout_sec=30, show_error=True):
     """Безопасная версия run_command с timeout"""
+    import subprocess
     try:
         result = subprocess.run(
             command, 
@@ -97,7 +96,11 @@ class QuantumPCIMonitor:
     
     def __init__(self, device_path: Optional[str] = None):
         self.device_path = self._find_device_path(device_path)
-        self._stop_monitoring = False
+        # Строковый префикс пути: без аллокации Path на каждое чтение
+        self._device_path_str = str(self.device_path) + "/" if self.device_path else None
+        self._stop_event = threading.Event()
+        # Кэш дескрипторов для атрибутов, опрашиваемых каждый тик
+        self._fd_cache: Dict[str, int] = {}
         
     def _find_device_path(self, device_path: Optional[str] = None) -> Optional[Path]:
         """Безопасный поиск пути к устройству"""
@@ -115,21 +118,28 @@ class QuantumPCIMonitor:
         timecard_path = Path("/sys/class/timecard")
         if timecard_path.exists() and timecard_path.is_dir():
             print(f"Checking timecard directory: {timecard_path}")
-            
-            for device_dir in timecard_path.iterdir():
-                if device_dir.is_dir() and device_dir.name.startswith("ocp"):
-                    print(f"Checking device: {device_dir}")
-                    
-                    # Проверяем основные файлы устройства
-                    essential_files = ["serialnum", "available_clock_sources"]
-                    if all((device_dir / f).exists() for f in essential_files):
-                        print(f"Device found and verified: {device_dir}")
-                        return device_dir
-                    else:
-                        print(f"Device {device_dir} failed verification")
+
+            # os.scandir отдаёт d_type из getdents64 — без stat на каждую запись
+            with os.scandir(timecard_path) as it:
+                for entry in it:
+                    # follow_symlinks по умолчанию: записи /sys/class/* — симлинки
+                    if entry.name.startswith("ocp") and entry.is_dir():
+                        print(f"Checking device: {entry.path}")
+
+                        # Проверяем основные файлы устройства одним listdir
+                        essential_files = {"serialnum", "available_clock_sources"}
+                        try:
+                            present = set(os.listdir(entry.path))
+                        except OSError:
+                            present = set()
+                        if essential_files <= present:
+                            print(f"Device found and verified: {entry.path}")
+                            return Path(entry.path)
+                        else:
+                            print(f"Device {entry.path} failed verification")
         else:
             print("Timecard directory not found or not accessible")
-        
+
         return None
     
     def is_device_available(self) -> bool:
@@ -138,19 +148,68 @@ class QuantumPCIMonitor:
     
     def read_device_file(self, file_name: str) -> Optional[str]:
         """Безопасное чтение файла устройства"""
-        if not self.device_path:
+        if not self._device_path_str:
             return None
-            
-        file_path = self.device_path / file_name
+
+        file_path = self._device_path_str + file_name
         try:
             with timeout(5):
-                if file_path.exists() and file_path.is_file():
-                    return file_path.read_text().strip()
+                with open(file_path, 'r') as f:
+                    return f.read().strip()
+        except FileNotFoundError:
+            pass
         except Exception as e:
             print(f"Error reading {file_path}: {e}")
-        
+
         return None
-    
+
+    def read_cached_attr(self, file_name: str) -> Optional[str]:
+        """Быстрое чтение атрибута через кэшированный дескриптор
+
+        Для атрибутов, опрашиваемых каждый тик: файл открывается один раз,
+        дальше каждый опрос — один os.pread с нулевого смещения (pread с
+        offset=0 заново вызывает show() драйвера). mmap для обычных
+        sysfs-атрибутов не поддерживается, поэтому это предел в 1 syscall.
+        """
+        fd = self._fd_cache.get(file_name)
+        if fd is None:
+            if not self._device_path_str:
+                return None
+            try:
+                fd = os.open(self._device_path_str + file_name, os.O_RDONLY)
+            except OSError:
+                return None
+            self._fd_cache[file_name] = fd
+
+        try:
+            return os.pread(fd, 4096, 0).decode('ascii', 'ignore').strip()
+        except OSError as e:
+            # Дескриптор мог устареть (переподключение устройства)
+            print(f"Error reading cached {file_name}: {e}")
+            self._fd_cache.pop(file_name, None)
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+            return None
+
+    def close(self):
+        """Освобождение кэшированных дескрипторов"""
+        for fd in self._fd_cache.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fd_cache.clear()
+
+    def read_device_files(self, file_names: List[str]) -> List[Optional[str]]:
+        """Пакетное чтение нескольких файлов устройства
+
+        Единая точка для пакетного чтения: любой будущий backend
+        (threadpool, io_uring, синхронный) подключается здесь.
+        """
+        return [self.read_device_file(name) for name in file_names]
+
     def scan_available_attributes(self) -> Dict[str, List[str]]:
         """Сканирование всех доступных атрибутов устройства"""
         available = {
@@ -205,176 +264,185 @@ class QuantumPCIMonitor:
     def _check_attribute_exists(self, attr_name: str) -> bool:
         """Проверка существования атрибута на устройстве"""
         try:
-            attr_path = self.device_path / attr_name
-            return attr_path.exists() and attr_path.is_file()
+            return os.path.isfile(self._device_path_str + attr_name)
         except Exception:
             return False
     
+    def _attribute_candidates(self) -> List[tuple]:
+        """Полный список кандидатов: (категория, группа, атрибут, имя файла)"""
+        candidates = []
+        for cat in ('basic', 'sma', 'tod'):
+            for attr in self.ALL_DEVICE_ATTRIBUTES[cat]:
+                candidates.append((cat, None, attr, attr))
+        for i in range(1, 5):
+            for attr in self.ALL_DEVICE_ATTRIBUTES['signal_generators']:
+                candidates.append(('signal_generators', f'signal{i}', attr, f'signal{i}_{attr}'))
+            for attr in self.ALL_DEVICE_ATTRIBUTES['frequency_counters']:
+                candidates.append(('frequency_counters', f'freq{i}', attr, f'freq{i}_{attr}'))
+        return candidates
+
+    def _probe_and_read_all(self) -> List[tuple]:
+        """Совмещённые сканирование и чтение атрибутов за один проход
+
+        Вместо stat каждого кандидата с последующим повторным обходом на
+        чтение каждый кандидат сразу открывается: ENOENT означает
+        отсутствие атрибута, успешное чтение одновременно и фиксирует его
+        доступность, и отдаёт значение.
+
+        Результат — плоский список записей
+        (категория, группа, атрибут, имя файла, значение); группировка по
+        категориям выполняется только на этапе представления.
+        """
+        records = []
+        prefix = self._device_path_str
+
+        for cat, group, attr, filename in self._attribute_candidates():
+            try:
+                with open(prefix + filename, 'r') as f:
+                    value = f.read().strip()
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                print(f"Error reading {filename}: {e}")
+                continue
+            records.append((cat, group, attr, filename, value))
+
+        return records
+
     def get_full_status(self) -> Dict[str, Any]:
         """Получение полного статуса устройства"""
         if not self.is_device_available():
             return {"error": "Device not available", "timestamp": datetime.now().isoformat()}
-        
+
         status = {
             "timestamp": datetime.now().isoformat(),
             "device_path": str(self.device_path),
-            "available_attributes": self.scan_available_attributes(),
             "basic_attributes": {},
             "sma_attributes": {},
             "tod_attributes": {},
             "signal_generators": {},
             "frequency_counters": {}
         }
-        
-        # Чтение всех доступных атрибутов
-        available = status["available_attributes"]
-        
-        # Основные атрибуты
-        for attr in available.get('basic', []):
-            value = self.read_device_file(attr)
-            if value is not None:
-                status["basic_attributes"][attr] = value
-        
-        # SMA атрибуты
-        for attr in available.get('sma', []):
-            value = self.read_device_file(attr)
-            if value is not None:
-                status["sma_attributes"][attr] = value
-        
-        # TOD атрибуты
-        for attr in available.get('tod', []):
-            value = self.read_device_file(attr)
-            if value is not None:
-                status["tod_attributes"][attr] = value
-        
-        # Генераторы сигналов
-        for gen_name, attrs in available.get('signal_generators', {}).items():
-            gen_status = {}
-            for attr in attrs:
-                value = self.read_device_file(f"{gen_name}_{attr}")
-                if value is not None:
-                    gen_status[attr] = value
-            if gen_status:
-                status["signal_generators"][gen_name] = gen_status
-        
-        # Частотные счетчики
-        for freq_name, attrs in available.get('frequency_counters', {}).items():
-            freq_status = {}
-            for attr in attrs:
-                value = self.read_device_file(f"{freq_name}_{attr}")
-                if value is not None:
-                    freq_status[attr] = value
-            if freq_status:
-                status["frequency_counters"][freq_name] = freq_status
-        
+
+        # Сканирование и чтение слиты в один проход по устройству;
+        # группировка плоских записей — только здесь, для представления
+        available = {
+            'basic': [],
+            'sma': [],
+            'tod': [],
+            'signal_generators': {},
+            'frequency_counters': {}
+        }
+        bucket_by_cat = {
+            'basic': status["basic_attributes"],
+            'sma': status["sma_attributes"],
+            'tod': status["tod_attributes"],
+        }
+
+        for cat, group, attr, _, value in self._probe_and_read_all():
+            if group is None:
+                available[cat].append(attr)
+                bucket_by_cat[cat][attr] = value
+            else:
+                available[cat].setdefault(group, []).append(attr)
+                status[cat].setdefault(group, {})[attr] = value
+
+        status["available_attributes"] = available
         return status
     
     def print_status_report(self):
         """Печать подробного отчета о состоянии устройства"""
-        print("=" * 80)
-        print("QUANTUM-PCI Pure CLI Monitor - Full Device Status Report")
-        print("=" * 80)
-        
+        # Отчет собирается в список строк и выводится одним write:
+        # один syscall вместо ~80 построчных print
+        parts = []
+        parts.append("=" * 80 + "\n")
+        parts.append("QUANTUM-PCI Pure CLI Monitor - Full Device Status Report\n")
+        parts.append("=" * 80 + "\n")
+
         status = self.get_full_status()
-        
+
         if "error" in status:
-            print(f"ERROR: {status['error']}")
+            parts.append(f"ERROR: {status['error']}\n")
+            sys.stdout.write("".join(parts))
             return
-        
-        print(f"Timestamp: {status['timestamp']}")
-        print(f"Device Path: {status['device_path']}")
-        print()
-        
+
+        parts.append(f"Timestamp: {status['timestamp']}\n")
+        parts.append(f"Device Path: {status['device_path']}\n\n")
+
         # Статистика атрибутов
         available = status['available_attributes']
-        total_basic = len(available.get('basic', []))
-        total_sma = len(available.get('sma', []))
-        total_tod = len(available.get('tod', []))
-        total_signal_gen = len(available.get('signal_generators', {}))
-        total_freq_count = len(available.get('frequency_counters', {}))
-        
-        print("ATTRIBUTE SUMMARY:")
-        print(f"  Basic attributes: {total_basic}")
-        print(f"  SMA attributes: {total_sma}")
-        print(f"  TOD attributes: {total_tod}")
-        print(f"  Signal generators: {total_signal_gen}")
-        print(f"  Frequency counters: {total_freq_count}")
-        print()
-        
-        # Основные атрибуты
-        if status.get('basic_attributes'):
-            print("BASIC ATTRIBUTES:")
-            for attr, value in status['basic_attributes'].items():
-                print(f"  {attr}: {value}")
-            print()
-        
-        # SMA атрибуты
-        if status.get('sma_attributes'):
-            print("SMA ATTRIBUTES:")
-            for attr, value in status['sma_attributes'].items():
-                print(f"  {attr}: {value}")
-            print()
-        
-        # TOD атрибуты
-        if status.get('tod_attributes'):
-            print("TOD ATTRIBUTES:")
-            for attr, value in status['tod_attributes'].items():
-                print(f"  {attr}: {value}")
-            print()
-        
-        # Генераторы сигналов
-        if status.get('signal_generators'):
-            print("SIGNAL GENERATORS:")
-            for gen_name, gen_data in status['signal_generators'].items():
-                print(f"  {gen_name}:")
-                for attr, value in gen_data.items():
-                    print(f"    {attr}: {value}")
-            print()
-        
-        # Частотные счетчики
-        if status.get('frequency_counters'):
-            print("FREQUENCY COUNTERS:")
-            for freq_name, freq_data in status['frequency_counters'].items():
-                print(f"  {freq_name}:")
-                for attr, value in freq_data.items():
-                    print(f"    {attr}: {value}")
-            print()
+        parts.append("ATTRIBUTE SUMMARY:\n")
+        parts.append(f"  Basic attributes: {len(available.get('basic', []))}\n")
+        parts.append(f"  SMA attributes: {len(available.get('sma', []))}\n")
+        parts.append(f"  TOD attributes: {len(available.get('tod', []))}\n")
+        parts.append(f"  Signal generators: {len(available.get('signal_generators', {}))}\n")
+        parts.append(f"  Frequency counters: {len(available.get('frequency_counters', {}))}\n\n")
+
+        # Плоские категории атрибутов
+        for header, bucket in (("BASIC ATTRIBUTES:", 'basic_attributes'),
+                               ("SMA ATTRIBUTES:", 'sma_attributes'),
+                               ("TOD ATTRIBUTES:", 'tod_attributes')):
+            if status.get(bucket):
+                parts.append(header + "\n")
+                for attr, value in status[bucket].items():
+                    parts.append(f"  {attr}: {value}\n")
+                parts.append("\n")
+
+        # Генераторы сигналов и частотные счетчики
+        for header, bucket in (("SIGNAL GENERATORS:", 'signal_generators'),
+                               ("FREQUENCY COUNTERS:", 'frequency_counters')):
+            if status.get(bucket):
+                parts.append(header + "\n")
+                for name, data in status[bucket].items():
+                    parts.append(f"  {name}:\n")
+                    for attr, value in data.items():
+                        parts.append(f"    {attr}: {value}\n")
+                parts.append("\n")
+
+        sys.stdout.write("".join(parts))
     
+    def stop(self):
+        """Остановка непрерывного мониторинга из другого потока"""
+        self._stop_event.set()
+
     def monitor_continuous(self, interval: int = 5, duration: int = 60):
         """Непрерывный мониторинг"""
         print(f"Starting continuous monitoring (interval: {interval}s, duration: {duration}s)")
         print("Press Ctrl+C to stop...")
-        
-        start_time = time.time()
+
+        self._stop_event.clear()
+        deadline = time.monotonic() + duration
         iteration = 0
-        
+
         try:
-            while not self._stop_monitoring:
-                current_time = time.time()
-                if current_time - start_time > duration:
-                    break
-                
+            # Event.wait вместо time.sleep: пауза прерывается сразу при stop()
+            while not self._stop_event.is_set() and time.monotonic() < deadline:
                 iteration += 1
                 print(f"\n--- Iteration {iteration} ({datetime.now().strftime('%H:%M:%S')}) ---")
-                
+
                 # Быстрая проверка основных параметров
                 if self.is_device_available():
-                    clock_source = self.read_device_file("clock_source")
-                    gnss_sync = self.read_device_file("gnss_sync")
+                    clock_source = self.read_cached_attr("clock_source")
+                    gnss_sync = self.read_cached_attr("gnss_sync")
                     print(f"Clock Source: {clock_source}, GNSS Sync: {gnss_sync}")
                 else:
                     print("Device not available")
-                
-                time.sleep(interval)
-                
+
+                if self._stop_event.wait(interval):
+                    break
+
         except KeyboardInterrupt:
             print("\nMonitoring stopped by user")
-        
+
         print(f"Monitoring completed after {iteration} iterations")
 
 
 def main():
     """Главная функция"""
+    # Импорты только для CLI-запуска: не нагружают импорт модуля как библиотеки
+    import argparse
+    import json
+
     parser = argparse.ArgumentParser(
         description="QUANTUM-PCI Pure CLI Monitor",
         formatter_class=argparse.RawDescriptionHelpFormatter
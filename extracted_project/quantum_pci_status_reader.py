@@ -8,40 +8,58 @@ import os
 import sys
 import time
 import json
-import signal
+import socket
+import struct
+import asyncio
 import argparse
 import subprocess
+import shlex
+import hashlib
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-from contextlib import contextmanager
 
 
-@contextmanager
-def timeout(duration):
-    """Контекстный менеджер для операций с timeout"""
-    def timeout_handler(signum, frame):
-        raise TimeoutError(f"Operation timed out after {duration} seconds")
-    
-    # Сохраняем старый обработчик
-    old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-    signal.alarm(duration)
-    
-    try:
-        yield
-    finally:
-        signal.alarm(0)
-        signal.signal(signal.SIGALRM, old_handler)
+try:
+    import orjson
 
+    def dumps_indented(obj) -> str:
+        """Сериализация в JSON с отступами через orjson (C-расширение)"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    # orjson не установлен — стандартный json, тот же формат вывода
+    def dumps_indented(obj) -> str:
+        """Сериализация в JSON с отступами через стандартный модуль"""
+        return json.dumps(obj, indent=2)
 
-def safe_run_command(command, timeout_sec=30, show_error=True):
-    """Безопасная версия run_command с timeout"""
+
+def safe_run_command(command, timeout_sec=30, show_error=True, capture=True):
+    """Безопасная версия run_command с timeout
+
+    Команда выполняется без промежуточного /bin/sh (нет лишнего
+    fork+exec и риска shell-инъекции). Принимает список аргументов;
+    строка для совместимости разбивается через shlex.split.
+    При capture=False вывод не буферизуется и не декодируется,
+    возвращается только признак успеха (returncode == 0).
+    """
+    if isinstance(command, str):
+        command = shlex.split(command)
     try:
+        if not capture:
+            result = subprocess.run(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=timeout_sec
+            )
+            return result.returncode == 0
+
         result = subprocess.run(
-            command, 
-            shell=True, 
-            capture_output=True, 
-            text=True, 
+            command,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
             timeout=timeout_sec
         )
         
@@ -69,11 +87,74 @@ def safe_run_command(command, timeout_sec=30, show_error=True):
 class QuantumPCIStatusReader:
     """Класс для чтения статусов платы QUANTUM-PCI"""
     
+    # Наборы файлов по категориям — неизменны на время работы
+    BASIC_FILES = ("serialnum", "clock_source", "gnss_sync",
+                   "clock_status_drift", "clock_status_offset")
+    GEN_FILES = ("duty", "period", "phase", "polarity", "running", "start", "signal")
+    FREQ_FILES = ("frequency", "seconds")
+
+    # UDS-сокет управления ptp4l (тот же, что использует pmc)
+    PTP4L_UDS_PATH = "/var/run/ptp4l"
+
     def __init__(self, device_path: Optional[str] = None):
         self.device_path = self._find_device_path(device_path)
         self.last_status = {}
         self._stop_monitoring = False
-        
+        self._pmc_socket = None
+        self._pmc_socket_path = None
+        self._pmc_seq = 0
+        # Кэш статических атрибутов: не меняются, пока устройство подключено
+        self._static_cache: Dict[str, str] = {}
+        self._was_available = False
+        # Долгоживущие дескрипторы горячих счетчиков (drift/offset/frequency)
+        self._hot_fds: Dict[Path, int] = {}
+        self._precompute_paths()
+
+    def _precompute_paths(self):
+        """Однократное построение всех Path-объектов горячих путей
+
+        Геттеры вызываются раз в секунду из мониторинга; конкатенация
+        Path на каждом вызове — чистые накладные расходы.
+        """
+        dp = self.device_path
+        if dp is None:
+            self._basic_paths = ()
+            self._sma_paths = ()
+            self._gen_paths = ()
+            self._freq_paths = ()
+            self._hot_paths = set()
+            return
+
+        self._basic_paths = tuple((name, dp / name) for name in self.BASIC_FILES)
+        self._clock_source_path = dp / "clock_source"
+        self._available_sources_path = dp / "available_clock_sources"
+        self._drift_path = dp / "clock_status_drift"
+        self._offset_path = dp / "clock_status_offset"
+        self._gnss_sync_path = dp / "gnss_sync"
+        self._available_inputs_path = dp / "available_sma_inputs"
+        self._available_outputs_path = dp / "available_sma_outputs"
+        self._sma_paths = tuple(
+            (f"sma{i}", dp / f"sma{i}", dp / f"sma{i}_out") for i in range(1, 5)
+        )
+        self._gen_paths = tuple(
+            (f"gen{i}", tuple((name, dp / f"gen{i}" / name) for name in self.GEN_FILES))
+            for i in range(1, 5)
+        )
+        self._freq_paths = tuple(
+            (f"freq{i}", tuple((name, dp / f"freq{i}" / name) for name in self.FREQ_FILES))
+            for i in range(1, 5)
+        )
+        # Атрибуты-счетчики, которые драйвер переписывает на месте:
+        # для них держится открытый fd и делается pread(0) вместо
+        # open/read/close на каждый опрос (sysfs не поддерживает mmap
+        # обычных атрибутов — pread по смещению 0 перезапускает show()).
+        self._hot_paths = {self._drift_path, self._offset_path} | {
+            path
+            for _freq_name, file_paths in self._freq_paths
+            for file_name, path in file_paths
+            if file_name == "frequency"
+        }
+
     def _find_device_path(self, device_path: Optional[str] = None) -> Optional[Path]:
         """Поиск пути к устройству"""
         if device_path:
@@ -94,105 +175,206 @@ class QuantumPCIStatusReader:
     
     def is_device_available(self) -> bool:
         """Проверка доступности устройства"""
-        return self.device_path is not None and self.device_path.exists()
+        available = self.device_path is not None and self.device_path.exists()
+        # Переподключение устройства обесценивает статический кэш
+        if available and not self._was_available:
+            self._static_cache.clear()
+        self._was_available = available
+        return available
     
-    def read_file_safe(self, file_path: Path) -> Optional[str]:
-        """Безопасное чтение файла"""
+    def _read_attr_bytes(self, file_path: Path) -> Optional[bytes]:
+        """Сырое чтение атрибута без декодирования
+
+        Один open/read/close вместо exists+is_file+read_text:
+        отсутствие файла дешевле узнать по ENOENT, чем двумя stat.
+        Горячие счетчики читаются через постоянный fd одним pread.
+        """
+        if file_path in self._hot_paths:
+            return self._pread_hot(file_path)
         try:
-            if file_path.exists() and file_path.is_file():
-                return file_path.read_text().strip()
+            fd = os.open(str(file_path), os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        except (PermissionError, OSError) as e:
+            print(f"Warning: Cannot read {file_path}: {e}")
+            return None
+        try:
+            return os.read(fd, 4096)
         except (PermissionError, OSError, IOError) as e:
             print(f"Warning: Cannot read {file_path}: {e}")
-        return None
+            return None
+        finally:
+            os.close(fd)
+
+    def _pread_hot(self, file_path: Path) -> Optional[bytes]:
+        """Чтение горячего атрибута через кэшированный дескриптор"""
+        fd = self._hot_fds.get(file_path)
+        if fd is None:
+            try:
+                fd = os.open(str(file_path), os.O_RDONLY)
+            except FileNotFoundError:
+                return None
+            except (PermissionError, OSError) as e:
+                print(f"Warning: Cannot read {file_path}: {e}")
+                return None
+            self._hot_fds[file_path] = fd
+        try:
+            return os.pread(fd, 4096, 0)
+        except OSError:
+            # Устройство переподключено — дескриптор протух
+            self._hot_fds.pop(file_path, None)
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+            return None
+
+    def close(self):
+        """Освобождение кэшированных дескрипторов и сокета pmc"""
+        for fd in self._hot_fds.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._hot_fds.clear()
+        if self._pmc_socket is not None:
+            self._pmc_socket.close()
+            self._pmc_socket = None
+        if self._pmc_socket_path:
+            try:
+                os.unlink(self._pmc_socket_path)
+            except OSError:
+                pass
+            self._pmc_socket_path = None
+
+    def read_file_safe(self, file_path: Path) -> Optional[str]:
+        """Безопасное чтение файла"""
+        data = self._read_attr_bytes(file_path)
+        if data is None:
+            return None
+        # sysfs отдаёт ASCII; дешёвый декодер вместо полной UTF-8 машины
+        return data.decode('ascii', 'ignore').strip()
+
+    def _device_subdirs(self) -> set:
+        """Имена дочерних элементов каталога устройства одним getdents"""
+        if not self.device_path:
+            return set()
+        try:
+            with os.scandir(self.device_path) as it:
+                return {entry.name for entry in it}
+        except OSError:
+            return set()
     
-    def get_basic_info(self) -> Dict[str, Any]:
+    def _read_static(self, name: str, file_path: Path,
+                     preread: Optional[Dict[Path, Optional[str]]] = None) -> Optional[str]:
+        """Чтение атрибута, неизменного на время работы устройства
+
+        serialnum и списки available_* задаются прошивкой; после первого
+        успешного чтения значение отдается из памяти без syscall.
+        """
+        value = self._static_cache.get(name)
+        if value is None:
+            value = self._value(file_path, preread)
+            if value is not None:
+                self._static_cache[name] = value
+        return value
+
+    def _value(self, file_path: Path, preread: Optional[Dict[Path, Optional[str]]] = None) -> Optional[str]:
+        """Значение атрибута из предварительно прочитанного набора или с диска"""
+        if preread is not None and file_path in preread:
+            return preread[file_path]
+        return self.read_file_safe(file_path)
+
+    def get_basic_info(self, ts: Optional[str] = None,
+                       preread: Optional[Dict[Path, Optional[str]]] = None) -> Dict[str, Any]:
         """Получение базовой информации об устройстве"""
         if not self.is_device_available():
             return {"error": "Device not available"}
-        
+        return self._get_basic_info_unchecked(ts, preread)
+
+    def _get_basic_info_unchecked(self, ts: Optional[str] = None,
+                                  preread: Optional[Dict[Path, Optional[str]]] = None) -> Dict[str, Any]:
+        """get_basic_info без проверки доступности устройства"""
         info = {
             "device_path": str(self.device_path),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ts or datetime.now().isoformat(),
         }
-        
-        # Основные файлы информации
-        basic_files = [
-            "serialnum", "clock_source", "gnss_sync", 
-            "clock_status_drift", "clock_status_offset"
-        ]
-        
-        for file_name in basic_files:
-            file_path = self.device_path / file_name
-            value = self.read_file_safe(file_path)
-            info[file_name] = value
-        
+
+        for file_name, file_path in self._basic_paths:
+            if file_name == "serialnum":
+                info[file_name] = self._read_static(file_name, file_path, preread)
+            else:
+                info[file_name] = self._value(file_path, preread)
+
         return info
-    
-    def get_clock_status(self) -> Dict[str, Any]:
+
+    def get_clock_status(self, ts: Optional[str] = None,
+                         preread: Optional[Dict[Path, Optional[str]]] = None) -> Dict[str, Any]:
         """Получение статуса синхронизации"""
         if not self.is_device_available():
             return {"error": "Device not available"}
-        
+        return self._get_clock_status_unchecked(ts, preread)
+
+    def _get_clock_status_unchecked(self, ts: Optional[str] = None,
+                                    preread: Optional[Dict[Path, Optional[str]]] = None) -> Dict[str, Any]:
+        """get_clock_status без проверки доступности устройства"""
         clock_status = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ts or datetime.now().isoformat(),
         }
-        
+
         # Текущий источник синхронизации
-        clock_source_file = self.device_path / "clock_source"
-        clock_status["current_source"] = self.read_file_safe(clock_source_file)
-        
+        clock_status["current_source"] = self._value(self._clock_source_path, preread)
+
         # Доступные источники
-        available_sources_file = self.device_path / "available_clock_sources"
-        available_sources = self.read_file_safe(available_sources_file)
+        available_sources = self._read_static("available_clock_sources",
+                                              self._available_sources_path, preread)
         if available_sources:
             clock_status["available_sources"] = available_sources.split()
-        
+
         # Статус дрейфа и смещения
-        drift_file = self.device_path / "clock_status_drift"
-        clock_status["drift"] = self.read_file_safe(drift_file)
-        
-        offset_file = self.device_path / "clock_status_offset"
-        clock_status["offset"] = self.read_file_safe(offset_file)
-        
+        clock_status["drift"] = self._value(self._drift_path, preread)
+        clock_status["offset"] = self._value(self._offset_path, preread)
+
         return clock_status
-    
-    def get_sma_status(self) -> Dict[str, Any]:
+
+    def get_sma_status(self, ts: Optional[str] = None,
+                       preread: Optional[Dict[Path, Optional[str]]] = None) -> Dict[str, Any]:
         """Получение статуса SMA портов"""
         if not self.is_device_available():
             return {"error": "Device not available"}
-        
+        return self._get_sma_status_unchecked(ts, preread)
+
+    def _get_sma_status_unchecked(self, ts: Optional[str] = None,
+                                  preread: Optional[Dict[Path, Optional[str]]] = None) -> Dict[str, Any]:
+        """get_sma_status без проверки доступности устройства"""
         sma_status = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ts or datetime.now().isoformat(),
             "inputs": {},
             "outputs": {},
         }
-        
+
         # Доступные входы
-        available_inputs_file = self.device_path / "available_sma_inputs"
-        available_inputs = self.read_file_safe(available_inputs_file)
+        available_inputs = self._read_static("available_sma_inputs",
+                                             self._available_inputs_path, preread)
         if available_inputs:
             sma_status["available_inputs"] = available_inputs.split()
-        
+
         # Доступные выходы
-        available_outputs_file = self.device_path / "available_sma_outputs"
-        available_outputs = self.read_file_safe(available_outputs_file)
+        available_outputs = self._read_static("available_sma_outputs",
+                                              self._available_outputs_path, preread)
         if available_outputs:
             sma_status["available_outputs"] = available_outputs.split()
-        
+
         # Текущие настройки SMA портов
-        for i in range(1, 5):
-            # Входы
-            sma_input_file = self.device_path / f"sma{i}"
-            input_value = self.read_file_safe(sma_input_file)
+        for name, input_path, output_path in self._sma_paths:
+            input_value = self._value(input_path, preread)
             if input_value is not None:
-                sma_status["inputs"][f"sma{i}"] = input_value
-            
-            # Выходы
-            sma_output_file = self.device_path / f"sma{i}_out"
-            output_value = self.read_file_safe(sma_output_file)
+                sma_status["inputs"][name] = input_value
+
+            output_value = self._value(output_path, preread)
             if output_value is not None:
-                sma_status["outputs"][f"sma{i}"] = output_value
-        
+                sma_status["outputs"][name] = output_value
+
         return sma_status
     
     def get_generator_status(self) -> Dict[str, Any]:
@@ -204,21 +386,26 @@ class QuantumPCIStatusReader:
             "timestamp": datetime.now().isoformat(),
         }
         
-        for i in range(1, 5):
-            gen_dir = self.device_path / f"gen{i}"
-            if gen_dir.exists() and gen_dir.is_dir():
-                gen_info = {}
-                
-                # Параметры генератора
-                gen_files = ["duty", "period", "phase", "polarity", "running", "start", "signal"]
-                for file_name in gen_files:
-                    file_path = gen_dir / file_name
-                    value = self.read_file_safe(file_path)
-                    if value is not None:
-                        gen_info[file_name] = value
-                
-                generators[f"gen{i}"] = gen_info
-        
+        children = self._device_subdirs()
+        # SoA-буферы локальные для вызова: Flask-сервер работает в
+        # многопоточном режиме и дергает этот метод с общего reader,
+        # разделяемый буфер на экземпляре давал бы гонку между запросами
+        soa = {name: [None] * 4 for name in self.GEN_FILES}
+
+        # Заполнение SoA-буферов...
+        for idx, (gen_name, file_paths) in enumerate(self._gen_paths):
+            if gen_name in children:
+                for file_name, file_path in file_paths:
+                    soa[file_name][idx] = self.read_file_safe(file_path)
+
+        # ...и AoS-представление только на этапе выдачи
+        for idx, (gen_name, _) in enumerate(self._gen_paths):
+            if gen_name in children:
+                generators[gen_name] = {
+                    name: soa[name][idx] for name in self.GEN_FILES
+                    if soa[name][idx] is not None
+                }
+
         return generators
     
     def get_frequency_counter_status(self) -> Dict[str, Any]:
@@ -230,35 +417,40 @@ class QuantumPCIStatusReader:
             "timestamp": datetime.now().isoformat(),
         }
         
-        for i in range(1, 5):
-            freq_dir = self.device_path / f"freq{i}"
-            if freq_dir.exists() and freq_dir.is_dir():
-                freq_info = {}
-                
-                # Параметры частотного счетчика
-                freq_files = ["frequency", "seconds"]
-                for file_name in freq_files:
-                    file_path = freq_dir / file_name
-                    value = self.read_file_safe(file_path)
-                    if value is not None:
-                        freq_info[file_name] = value
-                
-                freq_counters[f"freq{i}"] = freq_info
-        
+        children = self._device_subdirs()
+        # Локальные буферы по той же причине, что и в get_generator_status
+        soa = {name: [None] * 4 for name in self.FREQ_FILES}
+
+        for idx, (freq_name, file_paths) in enumerate(self._freq_paths):
+            if freq_name in children:
+                for file_name, file_path in file_paths:
+                    soa[file_name][idx] = self.read_file_safe(file_path)
+
+        for idx, (freq_name, _) in enumerate(self._freq_paths):
+            if freq_name in children:
+                freq_counters[freq_name] = {
+                    name: soa[name][idx] for name in self.FREQ_FILES
+                    if soa[name][idx] is not None
+                }
+
         return freq_counters
     
-    def get_gnss_status(self) -> Dict[str, Any]:
+    def get_gnss_status(self, ts: Optional[str] = None,
+                        preread: Optional[Dict[Path, Optional[str]]] = None) -> Dict[str, Any]:
         """Получение статуса GNSS"""
         if not self.is_device_available():
             return {"error": "Device not available"}
-        
+        return self._get_gnss_status_unchecked(ts, preread)
+
+    def _get_gnss_status_unchecked(self, ts: Optional[str] = None,
+                                   preread: Optional[Dict[Path, Optional[str]]] = None) -> Dict[str, Any]:
+        """get_gnss_status без проверки доступности устройства"""
         gnss_status = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ts or datetime.now().isoformat(),
         }
-        
+
         # GNSS синхронизация
-        gnss_sync_file = self.device_path / "gnss_sync"
-        sync_value = self.read_file_safe(gnss_sync_file)
+        sync_value = self._value(self._gnss_sync_path, preread)
         if sync_value:
             gnss_status["sync"] = sync_value
             # Правильная проверка: SYNC означает синхронизацию, LOST означает потерю сигнала
@@ -275,9 +467,10 @@ class QuantumPCIStatusReader:
             "timestamp": datetime.now().isoformat(),
         }
         
+        children = self._device_subdirs()
         for i in range(1, 5):
-            ts_dir = self.device_path / f"ts{i}"
-            if ts_dir.exists() and ts_dir.is_dir():
+            if f"ts{i}" in children:
+                ts_dir = self.device_path / f"ts{i}"
                 ts_info = {}
                 
                 # Чтение всех файлов в директории timestamper
@@ -291,36 +484,112 @@ class QuantumPCIStatusReader:
         
         return timestampers
     
+    def _pmc_get_current_data_set(self) -> Optional[Dict[str, Any]]:
+        """Запрос CURRENT_DATA_SET у ptp4l напрямую через UNIX-сокет
+
+        Разговаривает с ptp4l на management-протоколе PTP сам, без
+        fork/exec утилиты pmc на каждый опрос. Сокет открывается один раз
+        и переиспользуется.
+        """
+        if self._pmc_socket is None:
+            try:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                path = f"/var/run/quantum_pci_pmc.{os.getpid()}"
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                sock.bind(path)
+                sock.settimeout(1.0)
+                self._pmc_socket = sock
+                self._pmc_socket_path = path
+            except OSError:
+                return None
+
+        self._pmc_seq = (self._pmc_seq + 1) & 0xFFFF
+        # Management-сообщение PTP: 34 байта заголовка + 14 байт
+        # management-полей + TLV GET CURRENT_DATA_SET = 54 байта
+        header = struct.pack(
+            "!BBHBBHq4s8sHHBB",
+            0x0D,              # transportSpecific | messageType = MANAGEMENT
+            0x02,              # versionPTP
+            54,                # messageLength
+            0,                 # domainNumber
+            0,                 # reserved
+            0,                 # flagField
+            0,                 # correctionField
+            b"\x00" * 4,       # reserved
+            b"\x00" * 8,       # sourcePortIdentity: clockIdentity
+            os.getpid() & 0xFFFF,  # sourcePortIdentity: portNumber
+            self._pmc_seq,     # sequenceId
+            0x04,              # controlField = management
+            0x7F,              # logMessageInterval
+        )
+        body = struct.pack(
+            "!8sHBBBBHHH",
+            b"\xFF" * 8, 0xFFFF,  # targetPortIdentity: все часы
+            1, 1,                  # starting/boundaryHops
+            0, 0,                  # actionField = GET, reserved
+            0x0001,                # tlvType = MANAGEMENT
+            2,                     # lengthField
+            0x2001,                # managementId = CURRENT_DATA_SET
+        )
+
+        try:
+            self._pmc_socket.sendto(header + body, self.PTP4L_UDS_PATH)
+            reply = self._pmc_socket.recv(1500)
+        except OSError:
+            return None
+
+        # Ответ: заголовок(34) + management-поля(14) + TLV(6) + данные
+        if len(reply) < 54 + 18 or reply[0] & 0x0F != 0x0D:
+            return None
+        tlv_type, _, mgmt_id = struct.unpack_from("!HHH", reply, 48)
+        if tlv_type != 0x0001 or mgmt_id != 0x2001:
+            return None
+        steps_removed, offset_raw, delay_raw = struct.unpack_from("!Hqq", reply, 54)
+        return {
+            "steps_removed": steps_removed,
+            # TimeInterval: наносекунды в формате с фиксированной точкой <<16
+            "offset_from_master": offset_raw / 65536.0,
+            "mean_path_delay": delay_raw / 65536.0,
+        }
+
     def get_ptp_status(self) -> Dict[str, Any]:
         """Получение статуса PTP"""
         if not self.is_device_available():
             return {"error": "Device not available"}
-        
+
         ptp_status = {
             "timestamp": datetime.now().isoformat(),
         }
-        
+
         # PTP устройство
         ptp_link = self.device_path / "ptp"
         if ptp_link.exists():
             try:
                 ptp_device = ptp_link.resolve().name
                 ptp_status["device"] = ptp_device
-                
-                # Дополнительная информация о PTP через ptp4l
-                try:
-                    ptp_info = subprocess.run(
-                        ["pmc", "-u", "-b", "0", "GET CURRENT_DATA_SET"],
-                        capture_output=True, text=True, timeout=5
-                    )
-                    if ptp_info.returncode == 0:
-                        ptp_status["ptp_info"] = ptp_info.stdout.strip()
-                except (subprocess.TimeoutExpired, FileNotFoundError):
-                    pass
-                
+
+                # Данные CURRENT_DATA_SET напрямую от ptp4l
+                current_data_set = self._pmc_get_current_data_set()
+                if current_data_set is not None:
+                    ptp_status["current_data_set"] = current_data_set
+                else:
+                    # Fallback: утилита pmc, если сокет недоступен
+                    try:
+                        ptp_info = subprocess.run(
+                            ["pmc", "-u", "-b", "0", "GET CURRENT_DATA_SET"],
+                            capture_output=True, text=True, timeout=5
+                        )
+                        if ptp_info.returncode == 0:
+                            ptp_status["ptp_info"] = ptp_info.stdout.strip()
+                    except (subprocess.TimeoutExpired, FileNotFoundError):
+                        pass
+
             except Exception as e:
                 ptp_status["error"] = f"Cannot read PTP link: {e}"
-        
+
         return ptp_status
     
     def get_pps_status(self) -> Dict[str, Any]:
@@ -345,26 +614,101 @@ class QuantumPCIStatusReader:
     
     def get_full_status(self) -> Dict[str, Any]:
         """Получение полного статуса устройства"""
+        # Одна метка времени на весь снимок вместо четырех вызовов datetime.now
+        ts = datetime.now().isoformat()
         full_status = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ts,
             "device_available": self.is_device_available(),
         }
-        
-        if not self.is_device_available():
+
+        if not full_status["device_available"]:
             full_status["error"] = "Device not available"
             return full_status
-        
-        # Сбор всех статусов
+
+        # Сбор всех статусов; доступность уже проверена выше один раз,
+        # поэтому используются формы без повторных stat на device_path
         full_status.update({
-            "basic_info": self.get_basic_info(),
-            "clock_status": self.get_clock_status(),
-            "sma_status": self.get_sma_status(),
-            "gnss_status": self.get_gnss_status(),
+            "basic_info": self._get_basic_info_unchecked(ts),
+            "clock_status": self._get_clock_status_unchecked(ts),
+            "sma_status": self._get_sma_status_unchecked(ts),
+            "gnss_status": self._get_gnss_status_unchecked(ts),
         })
-        
+
         return full_status
     
-    def monitor_status(self, interval: float = 1.0, duration: Optional[float] = None, 
+    async def _read_all_async(self, paths: List[Path]) -> List[Optional[str]]:
+        """Конкурентное чтение набора файлов через пул потоков"""
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(
+            *(loop.run_in_executor(None, self.read_file_safe, path) for path in paths)
+        )
+
+    async def get_full_status_async(self) -> Dict[str, Any]:
+        """Асинхронная версия get_full_status
+
+        Все независимые чтения sysfs выполняются конкурентно, так что
+        суммарная задержка равна максимальной задержке одного файла, а не
+        их сумме. Сборка структур статуса переиспользует обычные геттеры
+        через словарь предварительно прочитанных значений.
+        """
+        ts = datetime.now().isoformat()
+        full_status = {
+            "timestamp": ts,
+            "device_available": self.is_device_available(),
+        }
+
+        if not full_status["device_available"]:
+            full_status["error"] = "Device not available"
+            return full_status
+
+        paths = [path for _, path in self._basic_paths]
+        paths += [
+            self._clock_source_path, self._available_sources_path,
+            self._drift_path, self._offset_path, self._gnss_sync_path,
+            self._available_inputs_path, self._available_outputs_path,
+        ]
+        for _, input_path, output_path in self._sma_paths:
+            paths.append(input_path)
+            paths.append(output_path)
+
+        preread = dict(zip(paths, await self._read_all_async(paths)))
+
+        full_status.update({
+            "basic_info": self._get_basic_info_unchecked(ts, preread),
+            "clock_status": self._get_clock_status_unchecked(ts, preread),
+            "sma_status": self._get_sma_status_unchecked(ts, preread),
+            "gnss_status": self._get_gnss_status_unchecked(ts, preread),
+        })
+
+        return full_status
+
+    @staticmethod
+    def _status_fingerprint(status: Dict[str, Any]) -> bytes:
+        """Хэш содержимого статуса без учета временных меток
+
+        Метки времени меняются каждую итерацию, поэтому исключаются —
+        иначе хэш никогда не совпадет и короткое замыкание не сработает.
+        """
+        h = hashlib.blake2b(digest_size=16)
+
+        def feed(obj):
+            if isinstance(obj, dict):
+                for key in sorted(obj):
+                    if key == "timestamp":
+                        continue
+                    h.update(str(key).encode())
+                    feed(obj[key])
+            elif isinstance(obj, (list, tuple)):
+                for item in obj:
+                    feed(item)
+            else:
+                h.update(repr(obj).encode())
+            h.update(b";")
+
+        feed(status)
+        return h.digest()
+
+    def monitor_status(self, interval: float = 1.0, duration: Optional[float] = None,
                       output_file: Optional[str] = None, format_type: str = "json"):
         """Безопасная версия мониторинга статуса с защитой от зависания"""
         if not self.is_device_available():
@@ -373,6 +717,7 @@ class QuantumPCIStatusReader:
         
         # Флаг остановки
         self._stop_monitoring = False
+        self._last_status_hash = None
         
         # Максимальное количество итераций для безопасности  
         max_iterations = 10000 if duration is None else int(duration / interval) + 100
@@ -383,9 +728,13 @@ class QuantumPCIStatusReader:
         print("Starting safe monitoring...")
         print(f"Duration: {duration}, Interval: {interval}, Max iterations: {max_iterations}")
         
+        # Файл вывода открывается один раз на весь запуск: без
+        # open/close на каждой итерации, запись одним вызовом
+        out_f = None
         if output_file:
             print(f"Output file: {output_file}")
-        
+            out_f = open(output_file, 'a', buffering=1 << 16)
+
         try:
             while (iteration_count < max_iterations and 
                    not self._stop_monitoring):
@@ -403,30 +752,37 @@ class QuantumPCIStatusReader:
                     print(f"Iteration {iteration_count}/{max_iterations}")
                 
                 try:
-                    # Получение статуса с timeout
-                    with timeout(10):  # 10 секунд timeout
-                        status = self.get_full_status()
-                    
-                    # Вывод статуса
-                    if format_type == "json":
-                        output = json.dumps(status, indent=2)
-                    elif format_type == "compact":
-                        output = self._format_compact_status(status)
-                    else:
-                        output = self._format_human_readable_status(status)
-                    
-                    # Вывод в файл или консоль
-                    if output_file:
-                        with open(output_file, 'a') as f:
-                            f.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}]\n")
-                            f.write(output + "\n\n")
-                    else:
-                        print(f"[{time.strftime('%H:%M:%S')}] Status updated")
-                        print("-" * 50)
+                    # Контроль длительности по монотонным часам: без SIGALRM
+                    # (сигналы работают только в главном потоке)
+                    read_start = time.monotonic()
+                    status = self.get_full_status()
+                    read_elapsed = time.monotonic() - read_start
+                    if read_elapsed > 10:
+                        print(f"Warning: Status read took {read_elapsed:.1f}s "
+                              f"at iteration {iteration_count}")
+
+                    # Короткое замыкание: если статус не изменился,
+                    # сериализация и запись пропускаются целиком
+                    status_hash = self._status_fingerprint(status)
+                    if status_hash != self._last_status_hash:
+                        self._last_status_hash = status_hash
+
+                        # Вывод статуса
+                        if format_type == "json":
+                            output = dumps_indented(status)
+                        elif format_type == "compact":
+                            output = self._format_compact_status(status)
+                        else:
+                            output = self._format_human_readable_status(status)
+
+                        # Вывод в файл или консоль
+                        if out_f:
+                            out_f.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}]\n"
+                                        + output + "\n\n")
+                        else:
+                            print(f"[{time.strftime('%H:%M:%S')}] Status updated")
+                            print("-" * 50)
                         
-                except TimeoutError:
-                    print(f"Warning: Status read timed out at iteration {iteration_count}")
-                    
                 except Exception as e:
                     print(f"Error getting status at iteration {iteration_count}: {e}")
                     
@@ -442,63 +798,70 @@ class QuantumPCIStatusReader:
         except Exception as e:
             print(f"Critical error in monitoring: {e}")
         finally:
+            if out_f:
+                out_f.close()
             print(f"Monitoring completed. Total iterations: {iteration_count}")
             self._stop_monitoring = True
     
     def _format_compact_status(self, status: Dict[str, Any]) -> str:
         """Форматирование компактного статуса"""
+        ts = status['timestamp']
         if not status.get("device_available"):
-            return f"[{status['timestamp']}] Device not available"
-        
-        basic = status.get("basic_info", {})
-        clock = status.get("clock_status", {})
-        gnss = status.get("gnss_status", {})
-        
-        return (f"[{status['timestamp']}] "
-                f"Clock: {clock.get('current_source', 'N/A')} "
-                f"GNSS: {'SYNC' if gnss.get('synchronized') else 'NO_SYNC'} "
-                f"Drift: {clock.get('drift', 'N/A')} "
-                f"Offset: {clock.get('offset', 'N/A')}")
+            return f"[{ts}] Device not available"
+
+        # Подсловари и значения связываются с локальными именами один раз
+        clock = status.get("clock_status") or {}
+        gnss = status.get("gnss_status") or {}
+        source = clock.get('current_source', 'N/A')
+        sync = 'SYNC' if gnss.get('synchronized') else 'NO_SYNC'
+        drift = clock.get('drift', 'N/A')
+        offset = clock.get('offset', 'N/A')
+
+        return f"[{ts}] Clock: {source} GNSS: {sync} Drift: {drift} Offset: {offset}"
     
     def _format_human_readable_status(self, status: Dict[str, Any]) -> str:
         """Форматирование человекочитаемого статуса"""
         if not status.get("device_available"):
             return f"Device not available at {status['timestamp']}"
-        
+
         output = []
         output.append(f"QUANTUM-PCI Status Report - {status['timestamp']}")
         output.append("=" * 60)
-        
+
         # Базовая информация
-        basic = status.get("basic_info", {})
+        basic = status.get("basic_info") or {}
         if basic:
             output.append("Basic Information:")
             output.append(f"  Device Path: {basic.get('device_path', 'N/A')}")
             output.append(f"  Serial Number: {basic.get('serialnum', 'N/A')}")
             output.append("")
-        
+
         # Статус синхронизации
-        clock = status.get("clock_status", {})
+        clock = status.get("clock_status") or {}
         if clock:
+            source = clock.get('current_source', 'N/A')
+            drift = clock.get('drift', 'N/A')
+            offset = clock.get('offset', 'N/A')
             output.append("Clock Synchronization:")
-            output.append(f"  Current Source: {clock.get('current_source', 'N/A')}")
-            output.append(f"  Drift: {clock.get('drift', 'N/A')}")
-            output.append(f"  Offset: {clock.get('offset', 'N/A')}")
-            if clock.get('available_sources'):
-                output.append(f"  Available Sources: {', '.join(clock['available_sources'])}")
+            output.append(f"  Current Source: {source}")
+            output.append(f"  Drift: {drift}")
+            output.append(f"  Offset: {offset}")
+            available_sources = clock.get('available_sources')
+            if available_sources:
+                output.append(f"  Available Sources: {', '.join(available_sources)}")
             output.append("")
-        
+
         # GNSS статус
-        gnss = status.get("gnss_status", {})
+        gnss = status.get("gnss_status") or {}
         if gnss:
-            output.append("GNSS Status:")
             sync_status = "SYNCHRONIZED" if gnss.get('synchronized') else "NOT SYNCHRONIZED"
+            output.append("GNSS Status:")
             output.append(f"  Synchronization: {sync_status}")
             output.append(f"  Raw Value: {gnss.get('sync', 'N/A')}")
             output.append("")
-        
+
         # Генераторы
-        generators = status.get("generator_status", {})
+        generators = status.get("generator_status") or {}
         if generators and len(generators) > 1:  # Больше чем только timestamp
             output.append("Signal Generators:")
             for gen_name, gen_info in generators.items():
@@ -510,8 +873,10 @@ class QuantumPCIStatusReader:
                         output.append(f"    Period: {gen_info.get('period', 'N/A')} ns")
                         output.append(f"    Duty: {gen_info.get('duty', 'N/A')}%")
             output.append("")
-        
-        return "\\n".join(output)
+
+        # Ровно одна конкатенация на весь отчет (ранее здесь
+        # склеивалось литеральной последовательностью "\n")
+        return "\n".join(output)
     
     def save_status_to_file(self, filename: str, format_type: str = "json"):
         """Сохранение текущего статуса в файл"""
@@ -519,7 +884,7 @@ class QuantumPCIStatusReader:
         
         if format_type == "json":
             with open(filename, 'w') as f:
-                json.dump(status, f, indent=2)
+                f.write(dumps_indented(status))
         else:
             with open(filename, 'w') as f:
                 f.write(self._format_human_readable_status(status))
@@ -590,7 +955,7 @@ def main():
     
     # Форматирование вывода
     if args.format == "json":
-        output = json.dumps(status, indent=2)
+        output = dumps_indented(status)
     elif args.format == "compact":
         output = reader._format_compact_status(status)
     else:
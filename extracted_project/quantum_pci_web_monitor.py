@@ -7,10 +7,19 @@ QUANTUM-PCI Web Status Monitor
 from flask import Flask, render_template, jsonify, request
 from flask_cors import CORS
 import json
+import struct
 import threading
 import time
+import multiprocessing
+from multiprocessing import shared_memory
 from quantum_pci_status_reader import QuantumPCIStatusReader
 
+# inotify_simple опционален: без него работает обычный опрос
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
 
 app = Flask(__name__)
 CORS(app)  # Разрешение CORS для всех доменов
@@ -21,6 +30,22 @@ current_status = {}
 monitoring_active = False
 monitoring_thread = None
 
+# Кэш статуса: одно чтение устройства обслуживает всех клиентов
+status_lock = threading.Lock()
+stop_event = threading.Event()
+status_updated_at = 0.0  # time.monotonic последнего обновления
+
+# Мониторинг в отдельном процессе: считыватель не конкурирует с
+# обработчиками Flask за GIL, статус передается через разделяемую
+# память с seqlock (один писатель, читатели без блокировок)
+SHM_SIZE = 64 * 1024
+# (seq, len, written_at); нечетный seq = идет запись. Метка времени —
+# time.monotonic(): CLOCK_MONOTONIC общесистемный, так что возраст
+# снимка сравним между процессом-считывателем и веб-процессом
+_SHM_HEADER = struct.Struct("=IId")
+status_shm = None
+reader_process = None
+
 
 def initialize_reader():
     """Инициализация считывателя статуса"""
@@ -29,26 +54,214 @@ def initialize_reader():
     return status_reader.is_device_available()
 
 
-def update_status_loop():
-    """Цикл обновления статуса"""
-    global current_status, monitoring_active
-    
-    while monitoring_active:
-        if status_reader and status_reader.is_device_available():
-            try:
-                current_status = status_reader.get_full_status()
-            except Exception as e:
-                current_status = {
-                    "error": f"Failed to read status: {str(e)}",
+def _shm_write_status(buf, payload: bytes):
+    """Seqlock-запись: seq делается нечетным на время копирования"""
+    seq = _SHM_HEADER.unpack_from(buf, 0)[0]
+    written_at = time.monotonic()
+    _SHM_HEADER.pack_into(buf, 0, seq + 1, len(payload), written_at)
+    buf[_SHM_HEADER.size:_SHM_HEADER.size + len(payload)] = payload
+    _SHM_HEADER.pack_into(buf, 0, seq + 2, len(payload), written_at)
+
+
+def _shm_read_status(buf):
+    """Seqlock-чтение с повтором, если запись шла параллельно
+
+    Возвращает (payload, written_at) либо None, если снимка еще нет.
+    """
+    for _ in range(5):
+        seq1, length, written_at = _SHM_HEADER.unpack_from(buf, 0)
+        if seq1 == 0 or seq1 & 1 or length > SHM_SIZE - _SHM_HEADER.size:
+            continue
+        data = bytes(buf[_SHM_HEADER.size:_SHM_HEADER.size + length])
+        if _SHM_HEADER.unpack_from(buf, 0)[0] == seq1:
+            return data, written_at
+    return None
+
+
+def _reader_process_main(shm_name: str, interval: float = 1.0):
+    """Тело процесса-считывателя: опрос устройства и запись в SHM"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    reader = QuantumPCIStatusReader()
+    try:
+        while True:
+            if reader.is_device_available():
+                try:
+                    status = reader.get_full_status()
+                except Exception as e:
+                    status = {
+                        "error": f"Failed to read status: {str(e)}",
+                        "timestamp": time.time()
+                    }
+            else:
+                status = {
+                    "error": "Device not available",
                     "timestamp": time.time()
                 }
-        else:
-            current_status = {
-                "error": "Device not available",
+
+            payload = json.dumps(status).encode()
+            if len(payload) <= SHM_SIZE - _SHM_HEADER.size:
+                _shm_write_status(shm.buf, payload)
+            time.sleep(interval)
+    finally:
+        shm.close()
+
+
+def refresh_status():
+    """Однократное чтение статуса устройства с обновлением кэша"""
+    global current_status, status_updated_at
+
+    if status_reader and status_reader.is_device_available():
+        try:
+            status = status_reader.get_full_status()
+        except Exception as e:
+            status = {
+                "error": f"Failed to read status: {str(e)}",
                 "timestamp": time.time()
             }
-        
-        time.sleep(1)  # Обновление каждую секунду
+    else:
+        status = {
+            "error": "Device not available",
+            "timestamp": time.time()
+        }
+
+    with status_lock:
+        current_status = status
+        status_updated_at = time.monotonic()
+
+    return status
+
+
+def get_cached_status(max_age: float = 0.5):
+    """Статус не старше max_age секунд: из кэша либо свежим чтением
+
+    Без активных клиентов устройство не опрашивается вовсе — чтение
+    происходит лениво по запросу, когда кэш устарел.
+    """
+    if reader_process is not None and reader_process.is_alive():
+        snapshot = _shm_read_status(status_shm.buf)
+        # Снимок отдается только если он не старше max_age; иначе
+        # проваливаемся на локальный кэш/прямое чтение, чтобы контракт
+        # ?interval= соблюдался и при работающем процессе-считывателе
+        if snapshot and time.monotonic() - snapshot[1] < max_age:
+            try:
+                return json.loads(snapshot[0])
+            except ValueError:
+                pass
+
+    with status_lock:
+        if current_status and time.monotonic() - status_updated_at < max_age:
+            return current_status
+
+    return refresh_status()
+
+
+def _apply_attr_change(name: str):
+    """Точечное обновление одного атрибута в кэшированном статусе"""
+    global status_updated_at
+
+    if not (status_reader and status_reader.device_path):
+        return
+    value = status_reader.read_file_safe(status_reader.device_path / name)
+
+    with status_lock:
+        status = current_status
+        if not status or "error" in status:
+            return
+
+        basic = status.get("basic_info", {})
+        if name in basic:
+            basic[name] = value
+
+        clock = status.get("clock_status", {})
+        if name == "clock_source":
+            clock["current_source"] = value
+        elif name == "clock_status_drift":
+            clock["drift"] = value
+        elif name == "clock_status_offset":
+            clock["offset"] = value
+        elif name == "gnss_sync" and value:
+            gnss = status.get("gnss_status", {})
+            gnss["sync"] = value
+            gnss["synchronized"] = value.strip().upper() == "SYNC"
+        elif name.startswith("sma"):
+            sma = status.get("sma_status", {})
+            if name.endswith("_out"):
+                sma.setdefault("outputs", {})[name[:-4]] = value
+            else:
+                sma.setdefault("inputs", {})[name] = value
+
+        status_updated_at = time.monotonic()
+
+
+def _inotify_status_loop():
+    """Событийный цикл: перечитываются только изменившиеся атрибуты
+
+    Страховочный полный рефреш раз в 5 секунд остаётся, так как не все
+    изменения sysfs-атрибутов порождают события inotify.
+    """
+    inotify = INotify()
+    inotify.add_watch(str(status_reader.device_path),
+                      inotify_flags.MODIFY | inotify_flags.CLOSE_WRITE)
+    refresh_status()
+    last_full_refresh = time.monotonic()
+
+    try:
+        while monitoring_active and not stop_event.is_set():
+            for event in inotify.read(timeout=1000):
+                if event.name:
+                    _apply_attr_change(event.name)
+
+            if time.monotonic() - last_full_refresh >= 5.0:
+                refresh_status()
+                last_full_refresh = time.monotonic()
+    finally:
+        inotify.close()
+
+
+def _start_monitoring_backend():
+    """Запуск мониторинга: отдельный процесс, при неудаче — поток"""
+    global monitoring_thread, reader_process, status_shm
+
+    stop_event.clear()
+    try:
+        if status_shm is None:
+            status_shm = shared_memory.SharedMemory(create=True, size=SHM_SIZE)
+            status_shm.buf[:_SHM_HEADER.size] = b"\x00" * _SHM_HEADER.size
+        reader_process = multiprocessing.Process(
+            target=_reader_process_main, args=(status_shm.name,), daemon=True
+        )
+        reader_process.start()
+        return
+    except (OSError, ValueError):
+        reader_process = None
+
+    monitoring_thread = threading.Thread(target=update_status_loop, daemon=True)
+    monitoring_thread.start()
+
+
+def _stop_monitoring_backend():
+    """Остановка мониторинга: процесс и/или поток"""
+    global reader_process
+
+    stop_event.set()
+    if reader_process is not None:
+        reader_process.terminate()
+        reader_process.join(timeout=2)
+        reader_process = None
+
+
+def update_status_loop(interval: float = 1.0):
+    """Цикл обновления статуса"""
+    if INotify is not None and status_reader and status_reader.device_path:
+        try:
+            _inotify_status_loop()
+            return
+        except OSError:
+            pass  # inotify на этой ФС недоступен — обычный опрос
+
+    # Event.wait вместо time.sleep: остановка срабатывает немедленно
+    while monitoring_active and not stop_event.wait(interval):
+        refresh_status()
 
 
 @app.route('/')
@@ -60,43 +273,42 @@ def index():
 @app.route('/api/status')
 def get_status():
     """API для получения текущего статуса"""
-    return jsonify(current_status)
+    # ?interval= задает допустимый возраст кэша в секундах
+    try:
+        max_age = float(request.args.get('interval', 0.5))
+    except ValueError:
+        max_age = 0.5
+    return jsonify(get_cached_status(max_age))
+
+
+def _cached_section(key: str):
+    """Срез общего кэшированного статуса для частичных API"""
+    status = get_cached_status()
+    return jsonify(status.get(key) or {"error": "Device not available"})
 
 
 @app.route('/api/status/basic')
 def get_basic_status():
     """API для получения базового статуса"""
-    if status_reader and status_reader.is_device_available():
-        return jsonify(status_reader.get_basic_info())
-    else:
-        return jsonify({"error": "Device not available"})
+    return _cached_section("basic_info")
 
 
 @app.route('/api/status/clock')
 def get_clock_status():
     """API для получения статуса синхронизации"""
-    if status_reader and status_reader.is_device_available():
-        return jsonify(status_reader.get_clock_status())
-    else:
-        return jsonify({"error": "Device not available"})
+    return _cached_section("clock_status")
 
 
 @app.route('/api/status/gnss')
 def get_gnss_status():
     """API для получения статуса GNSS"""
-    if status_reader and status_reader.is_device_available():
-        return jsonify(status_reader.get_gnss_status())
-    else:
-        return jsonify({"error": "Device not available"})
+    return _cached_section("gnss_status")
 
 
 @app.route('/api/status/sma')
 def get_sma_status():
     """API для получения статуса SMA"""
-    if status_reader and status_reader.is_device_available():
-        return jsonify(status_reader.get_sma_status())
-    else:
-        return jsonify({"error": "Device not available"})
+    return _cached_section("sma_status")
 
 
 @app.route('/api/status/generators')
@@ -121,12 +333,11 @@ def check_device():
 @app.route('/api/monitoring/start', methods=['POST'])
 def start_monitoring():
     """API для запуска мониторинга"""
-    global monitoring_active, monitoring_thread
+    global monitoring_active
     
     if not monitoring_active:
         monitoring_active = True
-        monitoring_thread = threading.Thread(target=update_status_loop, daemon=True)
-        monitoring_thread.start()
+        _start_monitoring_backend()
         return jsonify({"status": "started"})
     else:
         return jsonify({"status": "already_running"})
@@ -136,8 +347,9 @@ def start_monitoring():
 def stop_monitoring():
     """API для остановки мониторинга"""
     global monitoring_active
-    
+
     monitoring_active = False
+    _stop_monitoring_backend()
     return jsonify({"status": "stopped"})
 
 
@@ -150,21 +362,37 @@ def get_monitoring_status():
     })
 
 
-if __name__ == '__main__':
-    # Инициализация
+def create_app():
+    """Фабрика приложения для production WSGI-сервера
+
+    Мониторинг ведет отдельный процесс, пишущий снимок статуса в
+    разделяемую память, поэтому обработчики запросов не делят GIL со
+    считывателем sysfs. Запуск под gunicorn (один общий reader, пул
+    потоков вместо однопоточного dev-сервера Werkzeug):
+
+        gunicorn -w 1 -k gthread --threads 8 \
+            'quantum_pci_web_monitor:create_app()'
+    """
+    global monitoring_active
+
     device_available = initialize_reader()
-    
+
     if device_available:
         print("QUANTUM-PCI device detected")
         # Автоматический запуск мониторинга
         monitoring_active = True
-        monitoring_thread = threading.Thread(target=update_status_loop, daemon=True)
-        monitoring_thread.start()
+        _start_monitoring_backend()
     else:
         print("Warning: QUANTUM-PCI device not detected")
-    
-    # Запуск веб-сервера
+
+    return app
+
+
+if __name__ == '__main__':
+    create_app()
+
+    # Запуск веб-сервера (dev-режим; для production см. create_app)
     print("Starting QUANTUM-PCI Web Status Monitor...")
     print("Access the web interface at: http://localhost:5000")
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
 
@@ -5,16 +5,21 @@ Monitors functions and sysfs attributes of the ptp_ocp driver
 """
 
 import os
+import re
 import sys
 import time
 import json
 import logging
 import argparse
-import subprocess
 from datetime import datetime
 from pathlib import Path
 import threading
-import queue
+
+# inotify_simple is optional: without it the adaptive polling loop is used
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
 
 class PTPOCPMonitor:
     """Monitor for PTP OCP driver functions and sysfs attributes"""
@@ -22,7 +27,29 @@ class PTPOCPMonitor:
     def __init__(self, device_path=None, log_file=None):
         self.log_file = log_file or f"ptp_ocp_monitor_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
         self.running = False
-        self.data_queue = queue.Queue()
+        # Records stream straight to a JSON Lines file as they are
+        # produced, so memory stays flat no matter how long the run is
+        self._output_file = None
+        self._ndjson = None
+        self._ndjson_lock = threading.Lock()
+        # Main thread parks on this event instead of a sleep loop
+        self._stop = threading.Event()
+        # True when set_ftrace_filter holds the full function list, so
+        # trace_pipe only ever yields matching lines
+        self._ftrace_kernel_filtered = False
+        # Per-attribute read state specialized once at open time:
+        # attr -> (fd, fixed buffer, numeric?), so the hot loop does a
+        # single dict lookup per attribute and no Path construction
+        self._attr_state = {}
+        self._attr_paths = {}
+        # Adaptive poll interval: widens while values are static,
+        # narrows as soon as a change is observed
+        self._interval = 1.0
+        # Wall-clock epoch of the monotonic clock: per-event timestamps
+        # become one cheap monotonic_ns read plus an integer add, and
+        # stay strictly ordered even across wall-clock adjustments
+        self._epoch_ns = time.time_ns() - time.monotonic_ns()
+        self._last_values = None
         
         # Setup logging
         logging.basicConfig(
@@ -61,6 +88,14 @@ class PTPOCPMonitor:
             'tod_correction'
         ]
         
+        # Attributes whose values are plain integers; parsed to int so
+        # downstream consumers get numbers without a string round trip
+        self.numeric_attrs = {
+            'utc_tai_offset', 'clock_status_drift', 'clock_status_offset',
+            'external_pps_cable_delay', 'internal_pps_cable_delay',
+            'tod_correction', 'tod_baud_rate', 'ts_window_adjust',
+        }
+        
         # Functions to trace using ftrace
         self.trace_functions = [
             'ptp_ocp_gettimex',
@@ -84,6 +119,11 @@ class PTPOCPMonitor:
             'ptp_ocp_register_spi',
             'ptp_ocp_register_serial'
         ]
+        # One compiled alternation scans each trace line in a single
+        # pass instead of up to 20 separate substring searches
+        self._trace_func_re = re.compile(
+            '|'.join(re.escape(func) for func in self.trace_functions)
+        )
         
     def _find_ptp_ocp_device(self):
         """Find PTP OCP device in sysfs"""
@@ -134,37 +174,192 @@ class PTPOCPMonitor:
         
         # Not found in either location
         return None
-            
+
+    def _resolve_attr_path(self, attr_name):
+        """Resolve the on-disk path of a sysfs attribute (timecard subdir first)"""
+        timecard_path = self.device_path / 'timecard'
+        if timecard_path.exists():
+            for device in timecard_path.iterdir():
+                if device.is_dir():
+                    attr_path = device / attr_name
+                    if attr_path.exists():
+                        return attr_path
+        
+        attr_path = self.device_path / attr_name
+        if attr_path.exists():
+            return attr_path
+        return None
+
+    def _open_attr_fds(self, attrs):
+        """Open each available attribute once and keep the fds for the whole run
+        
+        The per-cycle open/read/close trio (and the directory walk that
+        read_sysfs_attr does to locate each attribute) collapses into a
+        single pread per attribute per cycle. sysfs re-runs the driver's
+        show() on every read at offset 0, so a persistent fd returns
+        fresh values.
+        """
+        opened = []
+        for attr in attrs:
+            attr_path = self._resolve_attr_path(attr)
+            if attr_path is None:
+                continue
+            try:
+                fd = os.open(str(attr_path), os.O_RDONLY)
+            except OSError as e:
+                self.logger.debug(f"Error opening {attr_path}: {e}")
+                continue
+            self._attr_state[attr] = (fd, bytearray(256), attr in self.numeric_attrs)
+            self._attr_paths[attr] = attr_path
+            opened.append(attr)
+        return opened
+
+    def _close_attr_fds(self):
+        """Release the cached attribute fds"""
+        for fd, _buf, _numeric in self._attr_state.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._attr_state.clear()
+        self._attr_paths.clear()
+
+    def _read_attr_fd(self, attr):
+        """Read one attribute through its cached fd into its fixed buffer"""
+        state = self._attr_state.get(attr)
+        if state is None:
+            return self.read_sysfs_attr(attr)
+        fd, buf, numeric = state
+        try:
+            n = os.preadv(fd, [buf], 0)
+        except OSError as e:
+            self.logger.debug(f"Error reading {attr}: {e}")
+            return None
+        if numeric:
+            try:
+                return int(buf[:n])
+            except ValueError:
+                pass  # e.g. "IN: ..." style values; fall through to str
+        return bytes(buf[:n]).decode('ascii', 'replace').strip()
+
     def monitor_sysfs(self):
         """Monitor sysfs attributes"""
-        # First, check which attributes are actually available
-        available_attrs = []
-        for attr in self.sysfs_attrs:
-            if self.read_sysfs_attr(attr) is not None:
-                available_attrs.append(attr)
+        # First, check which attributes are actually available and open
+        # a persistent fd for each; the hot loop then does one syscall
+        # per attribute instead of path resolution plus open/read/close
+        available_attrs = self._open_attr_fds(self.sysfs_attrs)
         
         if not available_attrs:
             self.logger.warning("No sysfs attributes found. Device may not be properly configured.")
             # Still continue but with minimal monitoring
-            available_attrs = ['uevent']  # uevent should always exist
+            available_attrs = self._open_attr_fds(['uevent'])  # uevent should always exist
         else:
             self.logger.info(f"Found {len(available_attrs)} available attributes: {', '.join(available_attrs)}")
         
-        while self.running:
-            timestamp = datetime.now().isoformat()
-            data = {'timestamp': timestamp, 'type': 'sysfs', 'attributes': {}}
-            
-            for attr in available_attrs:
-                value = self.read_sysfs_attr(attr)
-                if value is not None:
-                    data['attributes'][attr] = value
-                    
-            if data['attributes']:  # Only add if we have some data
-                self.data_queue.put(data)
-                self.logger.debug(f"Sysfs data: {json.dumps(data, indent=2)}")
+        # Prefer change notifications over polling when available:
+        # most of these attributes change rarely or never
+        if INotify is not None and available_attrs:
+            try:
+                self._inotify_sysfs_loop(available_attrs)
+                self._close_attr_fds()
+                return
+            except OSError:
+                self.logger.debug("inotify unavailable on sysfs, falling back to polling")
+
+        last_heartbeat = time.monotonic()
+        try:
+            while self.running:
+                timestamp = self._epoch_ns + time.monotonic_ns()
+                data = {'timestamp': timestamp, 'type': 'sysfs', 'attributes': {}}
+                
+                for attr in available_attrs:
+                    value = self._read_attr_fd(attr)
+                    if value is not None:
+                        data['attributes'][attr] = value
+                
+                # Adaptive pacing: back off while the device is idle,
+                # sample faster while attributes are changing
+                changed = data['attributes'] != self._last_values
+                if changed:
+                    self._last_values = dict(data['attributes'])
+                    self._interval = max(0.05, self._interval / 2)
+                else:
+                    self._interval = min(5.0, self._interval * 1.5)
+                
+                now = time.monotonic()
+                heartbeat_due = now - last_heartbeat >= 30.0
+                if data['attributes'] and (changed or heartbeat_due):
+                    last_heartbeat = now
+                    self._record(data)
+                    self.logger.debug("Sysfs data: %r", data)
+                
+                time.sleep(self._interval)
+        finally:
+            self._close_attr_fds()
             
-            time.sleep(1)  # Read every second
+    def _write_tracefs(self, name, content, append=False):
+        """Write a tracefs control file directly, without a shell subprocess"""
+        path = '/sys/kernel/debug/tracing/' + name
+        try:
+            with open(path, 'a' if append else 'w') as f:
+                f.write(content)
+            return True
+        except OSError as e:
+            self.logger.debug(f"Error writing {path}: {e}")
+            return False
+
+    def _sweep_attrs(self, attrs):
+        """Read a set of attributes into a record dict"""
+        data = {
+            'timestamp': self._epoch_ns + time.monotonic_ns(),
+            'type': 'sysfs',
+            'attributes': {},
+        }
+        for attr in attrs:
+            value = self._read_attr_fd(attr)
+            if value is not None:
+                data['attributes'][attr] = value
+        return data
+
+    def _inotify_sysfs_loop(self, available_attrs):
+        """Event-driven sysfs monitoring: re-read only what changed
+        
+        Not every sysfs attribute generates inotify events when the
+        driver updates it internally, so a periodic full sweep remains
+        as a safety net.
+        """
+        inotify = INotify()
+        watch_to_attr = {}
+        for attr in available_attrs:
+            wd = inotify.add_watch(str(self._attr_paths[attr]),
+                                   inotify_flags.MODIFY | inotify_flags.CLOSE_WRITE)
+            watch_to_attr[wd] = attr
+        self.logger.info(f"Using inotify for {len(watch_to_attr)} attributes")
+        
+        try:
+            data = self._sweep_attrs(available_attrs)
+            if data['attributes']:
+                self._record(data)
+            last_sweep = time.monotonic()
             
+            while self.running:
+                changed = {watch_to_attr[event.wd]
+                           for event in inotify.read(timeout=1000)
+                           if event.wd in watch_to_attr}
+                if changed:
+                    data = self._sweep_attrs(sorted(changed))
+                    if data['attributes']:
+                        self._record(data)
+                        self.logger.debug("Sysfs data: %r", data)
+                
+                if time.monotonic() - last_sweep >= 30.0:
+                    data = self._sweep_attrs(available_attrs)
+                    if data['attributes']:
+                        self._record(data)
+                    last_sweep = time.monotonic()
+        finally:
+            inotify.close()
+
     def setup_ftrace(self):
         """Setup ftrace for monitoring driver functions"""
         try:
@@ -184,34 +379,39 @@ class PTPOCPMonitor:
                 self.logger.warning("Function tracing not available in this kernel.")
                 return False
                 
+            # Grow the kernel ring so bursty trace workloads don't drop
+            # events while userspace catches up (per-CPU, in KB)
+            self._write_tracefs('buffer_size_kb', '16384')
+            
             # Enable function tracer
-            result = subprocess.run('echo function > /sys/kernel/debug/tracing/current_tracer', 
-                         shell=True, capture_output=True, text=True)
-            if result.returncode != 0:
-                self.logger.warning(f"Failed to enable function tracer: {result.stderr}")
+            if not self._write_tracefs('current_tracer', 'function'):
+                self.logger.warning("Failed to enable function tracer")
                 return False
             
-            # Clear existing filters
-            subprocess.run('echo > /sys/kernel/debug/tracing/set_ftrace_filter', 
-                         shell=True, check=False)  # Don't fail if this doesn't work
+            # Clear existing filters (don't fail if this doesn't work)
+            self._write_tracefs('set_ftrace_filter', '')
             
-            # Add our functions to filter (try each one individually)
+            # Add all functions in one write; if the kernel rejects the
+            # batch (some symbol missing), fall back to per-function writes
             successful_filters = 0
-            for func in self.trace_functions:
-                cmd = f'echo {func} >> /sys/kernel/debug/tracing/set_ftrace_filter'
-                result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-                if result.returncode == 0:
-                    successful_filters += 1
-                else:
-                    self.logger.debug(f"Failed to add filter for {func}: {result.stderr}")
+            if self._write_tracefs('set_ftrace_filter',
+                                   '\n'.join(self.trace_functions) + '\n'):
+                successful_filters = len(self.trace_functions)
+                self._ftrace_kernel_filtered = True
+            else:
+                for func in self.trace_functions:
+                    if self._write_tracefs('set_ftrace_filter', func + '\n',
+                                           append=True):
+                        successful_filters += 1
+                    else:
+                        self.logger.debug(f"Failed to add filter for {func}")
                     
             if successful_filters == 0:
                 self.logger.warning("No function filters could be added. Functions may not be available.")
                 return False
                 
             # Enable tracing
-            subprocess.run('echo 1 > /sys/kernel/debug/tracing/tracing_on', 
-                         shell=True, check=True)
+            self._write_tracefs('tracing_on', '1')
             
             self.logger.info(f"Function tracing enabled for {successful_filters}/{len(self.trace_functions)} functions")
             return True
@@ -224,51 +424,107 @@ class PTPOCPMonitor:
         """Cleanup ftrace settings"""
         try:
             if os.geteuid() == 0:
-                subprocess.run('echo 0 > /sys/kernel/debug/tracing/tracing_on', 
-                             shell=True, check=True)
-                subprocess.run('echo > /sys/kernel/debug/tracing/set_ftrace_filter', 
-                             shell=True, check=True)
+                self._write_tracefs('tracing_on', '0')
+                self._write_tracefs('set_ftrace_filter', '')
                 self.logger.info("Function tracing disabled")
         except Exception as e:
             self.logger.error(f"Failed to cleanup ftrace: {e}")
             
+    def _splice_ftrace_raw(self):
+        """Move trace_pipe bytes to disk entirely in the kernel
+        
+        With the full function list applied in set_ftrace_filter every
+        line in trace_pipe is already relevant, so the decode/match/JSON
+        wrap in Python is pure overhead. os.splice stages the data
+        through a pipe pair page-by-page without any userspace copy;
+        capture becomes disk-bound instead of Python-bound.
+        """
+        raw_path = f"ptp_ocp_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.raw"
+        trace_fd = os.open('/sys/kernel/debug/tracing/trace_pipe', os.O_RDONLY)
+        out_fd = os.open(raw_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        pipe_r, pipe_w = os.pipe()
+        self.logger.info(f"Raw ftrace capture to {raw_path}")
+        try:
+            while self.running:
+                n = os.splice(trace_fd, pipe_w, 1 << 20)
+                if n == 0:
+                    continue
+                while n > 0:
+                    n -= os.splice(pipe_r, out_fd, n)
+        finally:
+            for fd in (pipe_r, pipe_w, trace_fd, out_fd):
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
     def read_ftrace_buffer(self):
-        """Read ftrace buffer"""
+        """Read ftrace buffer
+        
+        trace_pipe is drained in 64 KB chunks rather than line by line,
+        so one wakeup from the kernel hands over a whole batch of events
+        instead of costing a read() per line.
+        """
+        if self._ftrace_kernel_filtered and hasattr(os, 'splice'):
+            try:
+                self._splice_ftrace_raw()
+                return
+            except OSError as e:
+                self.logger.debug(f"splice capture unavailable: {e}")
+        
         try:
-            with open('/sys/kernel/debug/tracing/trace_pipe', 'r') as f:
+            fd = os.open('/sys/kernel/debug/tracing/trace_pipe', os.O_RDONLY)
+            pending = b''
+            try:
                 while self.running:
-                    line = f.readline()
-                    if line:
+                    chunk = os.read(fd, 1 << 16)
+                    if not chunk:
+                        continue
+                    pending += chunk
+                    lines = pending.split(b'\n')
+                    pending = lines.pop()  # partial trailing line, if any
+                    timestamp = self._epoch_ns + time.monotonic_ns()
+                    for raw_line in lines:
+                        line = raw_line.decode('ascii', 'replace')
                         # Parse ftrace output
-                        if any(func in line for func in self.trace_functions):
-                            timestamp = datetime.now().isoformat()
+                        if self._trace_func_re.search(line):
                             data = {
                                 'timestamp': timestamp,
                                 'type': 'ftrace',
                                 'trace': line.strip()
                             }
-                            self.data_queue.put(data)
-                            self.logger.debug(f"Ftrace: {line.strip()}")
+                            self._record(data)
+                            self.logger.debug("Ftrace: %s", data['trace'])
+            finally:
+                os.close(fd)
         except Exception as e:
             self.logger.error(f"Error reading ftrace: {e}")
             
+    def _record(self, data):
+        """Append one record to the JSON Lines output file"""
+        if self._ndjson is None:
+            return
+        line = json.dumps(data) + '\n'
+        # sysfs and ftrace threads both record; serialize the writes
+        with self._ndjson_lock:
+            self._ndjson.write(line)
+
     def save_data(self):
-        """Save collected data to file"""
-        output_file = f"ptp_ocp_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        data_list = []
-        
-        while not self.data_queue.empty():
-            data_list.append(self.data_queue.get())
-            
-        with open(output_file, 'w') as f:
-            json.dump(data_list, f, indent=2)
-            
-        self.logger.info(f"Data saved to {output_file}")
+        """Flush and close the streaming output file"""
+        if self._ndjson is not None:
+            self._ndjson.close()
+            self._ndjson = None
+            self.logger.info(f"Data saved to {self._output_file}")
         
     def start(self):
         """Start monitoring"""
         self.running = True
         
+        # Open the streaming output up front; records are written as
+        # they occur instead of being accumulated until shutdown
+        self._output_file = f"ptp_ocp_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson"
+        self._ndjson = open(self._output_file, 'a', buffering=1 << 20)
+        
         # Start sysfs monitoring thread
         sysfs_thread = threading.Thread(target=self.monitor_sysfs)
         sysfs_thread.start()
@@ -282,11 +538,13 @@ class PTPOCPMonitor:
         self.logger.info("Monitoring started. Press Ctrl+C to stop.")
         
         try:
-            while True:
-                time.sleep(1)
+            # Sleep until interrupted — no periodic wakeups just to
+            # check for Ctrl+C
+            self._stop.wait()
         except KeyboardInterrupt:
             self.logger.info("Stopping monitor...")
             self.running = False
+            self._stop.set()
             
             # Wait for threads to finish
             sysfs_thread.join()
@@ -6,6 +6,8 @@ Traces function calls in the ptp_ocp driver
 
 import os
 import sys
+import ctypes
+import struct
 import argparse
 import signal
 from datetime import datetime
@@ -20,7 +22,10 @@ except ImportError:
     print("  RHEL/CentOS: sudo yum install bcc-tools python-bcc")
     sys.exit(1)
 
-# eBPF program
+# eBPF program: compiled once and shared by every traced function.
+# The entry probe records the probed address alongside the start time,
+# and the return probe resolves the function name through the
+# ip_to_name map populated from userspace after attach.
 BPF_PROGRAM = """
 #include <linux/ptrace.h>
 #include <linux/sched.h>
@@ -34,28 +39,41 @@ struct data_t {
     u64 duration_ns;
 };
 
-BPF_HASH(start_times, u64);
-BPF_PERF_OUTPUT(events);
+struct start_t {
+    u64 ts;
+    u64 ip;
+};
+
+struct name_t {
+    char name[32];
+};
+
+BPF_HASH(start_times, u64, struct start_t);
+BPF_HASH(ip_to_name, u64, struct name_t);
+BPF_RINGBUF_OUTPUT(events, 8);
 
 // Function entry probe
 int trace_func_entry(struct pt_regs *ctx) {
     u64 pid_tgid = bpf_get_current_pid_tgid();
-    u64 ts = bpf_ktime_get_ns();
+    struct start_t start = {};
     
-    start_times.update(&pid_tgid, &ts);
+    start.ts = bpf_ktime_get_ns();
+    start.ip = PT_REGS_IP(ctx);
+    start_times.update(&pid_tgid, &start);
     return 0;
 }
 
 // Function return probe
 int trace_func_return(struct pt_regs *ctx) {
     u64 pid_tgid = bpf_get_current_pid_tgid();
-    u64 *start_ts = start_times.lookup(&pid_tgid);
+    struct start_t *start = start_times.lookup(&pid_tgid);
     
-    if (start_ts == 0) {
+    if (start == 0) {
         return 0;  // Entry not found
     }
     
-    u64 duration = bpf_ktime_get_ns() - *start_ts;
+    u64 duration = bpf_ktime_get_ns() - start->ts;
+    u64 ip = start->ip;
     start_times.delete(&pid_tgid);
     
     struct data_t data = {};
@@ -66,11 +84,13 @@ int trace_func_return(struct pt_regs *ctx) {
     
     bpf_get_current_comm(&data.comm, sizeof(data.comm));
     
-    // Copy function name
-    const char *func_name = "FUNC_NAME_PLACEHOLDER";
-    bpf_probe_read_kernel_str(&data.func_name, sizeof(data.func_name), func_name);
+    // Copy function name from the userspace-populated map
+    struct name_t *name = ip_to_name.lookup(&ip);
+    if (name != 0) {
+        bpf_probe_read_kernel_str(&data.func_name, sizeof(data.func_name), name->name);
+    }
     
-    events.perf_submit(ctx, &data, sizeof(data));
+    events.ringbuf_output(&data, sizeof(data), 0);
     
     return 0;
 }
@@ -82,7 +102,9 @@ class PTPOCPTracer:
     def __init__(self, duration_filter=0):
         self.duration_filter = duration_filter * 1000  # Convert to nanoseconds
         self.running = True
-        self.bpf_programs = [{}]
+        # Matches struct data_t in BPF_PROGRAM; unpacking the raw bytes
+        # once is much cheaper per event than ctypes field descriptors
+        self._event_fmt = struct.Struct('<QII16s32sQ')
         
         # Core functions that are most likely to be available
         self.trace_functions = [
@@ -98,14 +120,22 @@ class PTPOCPTracer:
         """Check which functions are available in kallsyms"""
         available_functions = []
         try:
-            with open('/proc/kallsyms', 'r') as f:
-                kallsyms = f.read()
-                for func in self.trace_functions:
-                    if func in kallsyms:
-                        available_functions.append(func)
-                        print(f"✓ Function {func} is available")
-                    else:
-                        print(f"✗ Function {func} is not available")
+            # One pass over kallsyms into a set of symbol names: each
+            # lookup is then exact and O(1), instead of a substring scan
+            # of the whole multi-megabyte text per function (which also
+            # false-matched on prefixes like ptp_ocp_adjtime_coarse)
+            with open('/proc/kallsyms', 'r', buffering=1 << 20) as f:
+                symbols = set()
+                for line in f:
+                    parts = line.split()
+                    if len(parts) >= 3:
+                        symbols.add(parts[2])
+            for func in self.trace_functions:
+                if func in symbols:
+                    available_functions.append(func)
+                    print(f"✓ Function {func} is available")
+                else:
+                    print(f"✗ Function {func} is not available")
         except Exception as e:
             print(f"Warning: Could not read /proc/kallsyms: {e}")
             # Fallback to original list
@@ -113,37 +143,43 @@ class PTPOCPTracer:
             
         return available_functions
 
-    def create_bpf_program(self, func_name):
-        """Create BPF program for a specific function"""
-        # Replace placeholder with actual function name
-        program = BPF_PROGRAM.replace("FUNC_NAME_PLACEHOLDER", func_name)
-        
+    def attach_function(self, b, func_name):
+        """Attach the shared entry/return probes to one function"""
         try:
-            b = BPF(text=program)
-            
-            # Attach kprobe and kretprobe
             b.attach_kprobe(event=func_name, fn_name="trace_func_entry")
             b.attach_kretprobe(event=func_name, fn_name="trace_func_return")
-            
-            return b
+            return True
         except Exception as e:
             print(f"Warning: Failed to attach to {func_name}: {e}")
-            return None
+            return False
+
+    def _register_function_name(self, b, func_name):
+        """Map the function's kernel address to its name for the BPF side"""
+        addr = BPF.ksymname(func_name)
+        if addr == -1:
+            return
+        table = b["ip_to_name"]
+        leaf = table.Leaf()
+        leaf.name = func_name.encode()[:31]
+        table[table.Key(addr)] = leaf
             
     def print_event(self, cpu, data, size):
         """Print traced event"""
-        event = self.bpf_programs[0]["events"].event(data)
+        _, pid, tid, comm, func_name, duration_ns = self._event_fmt.unpack_from(
+            ctypes.string_at(data, size))
         
         # Apply duration filter
-        if self.duration_filter > 0 and event.duration_ns < self.duration_filter:
+        if self.duration_filter > 0 and duration_ns < self.duration_filter:
             return
             
         timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        duration_us = event.duration_ns / 1000.0
+        duration_us = duration_ns / 1000.0
+        comm_str = comm.rstrip(b"\x00").decode('utf-8', 'replace')
+        func_str = func_name.rstrip(b"\x00").decode('utf-8', 'replace')
         
-        print(f"[{timestamp}] {event.comm.decode('utf-8', 'replace'):16} "
-              f"PID:{event.pid:6} TID:{event.tid:6} "
-              f"{event.func_name.decode('utf-8', 'replace'):32} "
+        print(f"[{timestamp}] {comm_str:16} "
+              f"PID:{pid:6} TID:{tid:6} "
+              f"{func_str:32} "
               f"duration: {duration_us:8.2f} μs")
               
     def start_tracing(self):
@@ -164,25 +200,29 @@ class PTPOCPTracer:
         print(f"Found {len(available_functions)} available functions")
         print("Press Ctrl+C to stop\n")
         
-        # Create BPF programs for available functions only
-        active_bpf = None
-        successful_attachments = 0
+        # Compile the shared BPF program once, then attach it to every
+        # available function — one clang invocation and one event buffer
+        # instead of a compile/load per function
+        try:
+            active_bpf = BPF(text=BPF_PROGRAM)
+        except Exception as e:
+            print(f"Error: Failed to load BPF program: {e}")
+            return
         
+        successful_attachments = 0
         for func in available_functions:
-            b = self.create_bpf_program(func)
-            if b:
-                if not active_bpf:
-                    active_bpf = b
-                    # Set up perf buffer callback
-                    b["events"].open_perf_buffer(self.print_event)
-                    self.bpf_programs[0] = b
+            if self.attach_function(active_bpf, func):
+                self._register_function_name(active_bpf, func)
                 successful_attachments += 1
-                    
-        if not active_bpf or successful_attachments == 0:
+        
+        if successful_attachments == 0:
             print("Error: No functions could be traced successfully.")
             print("The functions might be inlined or not currently loaded.")
             return
             
+        # Set up ring buffer callback
+        active_bpf["events"].open_ring_buffer(self.print_event)
+        
         print(f"Successfully attached to {successful_attachments} functions...")
         print("Function                         Duration (μs)")
         print("-" * 60)
@@ -190,7 +230,7 @@ class PTPOCPTracer:
         # Main loop
         while self.running:
             try:
-                active_bpf.perf_buffer_poll()
+                active_bpf.ring_buffer_poll(100)
             except KeyboardInterrupt:
                 self.running = False
                 
@@ -236,7 +276,8 @@ def main():
     check_requirements()
     
     # Create tracer
-    tracer = PTPOCPTracer(duration_filter=args.duration)  # Convert to nanoseconds
+    # args.duration is in microseconds; __init__ converts to nanoseconds
+    tracer = PTPOCPTracer(duration_filter=args.duration)
     
     # Override function list if specific functions are requested
     if args.function:
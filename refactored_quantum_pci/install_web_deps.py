@@ -28,28 +28,19 @@ def install_dependencies():
         print("❌ pip не найден. Установите pip сначала.")
         sys.exit(1)
     
-    success_count = 0
-    total_count = len(web_deps)
-    
-    for dep in web_deps:
-        print(f"\n📦 Устанавливаю {dep}...")
-        try:
-            result = subprocess.run([
-                sys.executable, "-m", "pip", "install", dep
-            ], capture_output=True, text=True, check=True)
-            
-            print(f"✅ {dep} установлен успешно")
-            success_count += 1
-            
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Ошибка установки {dep}:")
-            print(f"   {e.stderr}")
-            continue
+    # Один вызов pip на весь список: резолвер и HTTP-соединения
+    # переиспользуются, вместо пяти запусков процесса — один.
+    # Вывод pip идет напрямую в терминал, без буферизации в память
+    print(f"\n📦 Устанавливаю: {', '.join(web_deps)}...")
+    result = subprocess.run(
+        [sys.executable, "-m", "pip", "install", *web_deps],
+        check=False, text=True
+    )
+    success = result.returncode == 0
     
     print("\n" + "=" * 60)
-    print(f"📊 Результат: {success_count}/{total_count} зависимостей установлено")
     
-    if success_count == total_count:
+    if success:
         print("🎉 Все зависимости установлены успешно!")
         print("\nТеперь вы можете запустить веб интерфейс:")
         print("   python main.py --web")
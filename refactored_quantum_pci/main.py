@@ -5,28 +5,42 @@
 
 import sys
 import argparse
+import atexit
 import logging
+import logging.handlers
+import queue
 import os
 from pathlib import Path
 
 # Добавление текущей директории в путь Python
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from src.api.status_reader import StatusReader
-from src.core.device import QuantumPCIDevice
 from src.core.exceptions import QuantumPCIError, DeviceNotFoundError
 
 
 def setup_logging(level: str = "INFO"):
-    """Настройка логирования"""
+    """Настройка логирования
+
+    Запись в файл идет через QueueHandler/QueueListener: горячий поток
+    только кладет запись в очередь, а write() в файл выполняет фоновый
+    поток слушателя, не задерживая мониторинг и обработку запросов.
+    """
     log_level = getattr(logging, level.upper(), logging.INFO)
     
+    log_queue = queue.Queue(-1)
+    file_handler = logging.FileHandler('quantum_pci.log')
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    
     logging.basicConfig(
         level=log_level,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
             logging.StreamHandler(),
-            logging.FileHandler('quantum_pci.log')
+            logging.handlers.QueueHandler(log_queue)
         ]
     )
 
@@ -52,7 +66,15 @@ def check_gui_available():
 
 
 def run_cli_mode(device_path: str = None):
-    """Запуск в режиме командной строки"""
+    """Запуск в режиме командной строки
+
+    Возвращает (device, status_reader) — экспорт после вывода статуса
+    переиспользует их вместо повторного поиска устройства.
+    """
+    # Импорт при входе в режим: GUI/web-режимам эти модули не нужны
+    from src.api.status_reader import StatusReader
+    from src.core.device import QuantumPCIDevice
+    
     try:
         print("QUANTUM-PCI Configuration Tool v2.0 - CLI Mode")
         print("=" * 50)
@@ -60,33 +82,41 @@ def run_cli_mode(device_path: str = None):
         device = QuantumPCIDevice(device_path)
         status_reader = StatusReader(device)
         
+        # Отчет собирается в список и выводится одной записью в stdout
+        parts = []
+        
         # Получение и вывод основной информации
         device_info = device.get_device_info()
-        print(f"Device Path: {device_info['device_path']}")
-        print(f"Serial Number: {device_info['serial_number']}")
-        print(f"Current Clock Source: {device_info['current_clock_source']}")
-        print(f"GNSS Sync: {device_info['gnss_sync']}")
+        parts.append(f"Device Path: {device_info['device_path']}\n")
+        parts.append(f"Serial Number: {device_info['serial_number']}\n")
+        parts.append(f"Current Clock Source: {device_info['current_clock_source']}\n")
+        parts.append(f"GNSS Sync: {device_info['gnss_sync']}\n")
         
         # Получение статуса
         full_status = status_reader.get_full_status()
         health_status = full_status['health_status']
         
-        print(f"\nHealth Status: {'✓ HEALTHY' if health_status['healthy'] else '✗ UNHEALTHY'}")
+        parts.append(f"\nHealth Status: {'✓ HEALTHY' if health_status['healthy'] else '✗ UNHEALTHY'}\n")
         
-        print("\nHealth Checks:")
+        parts.append("\nHealth Checks:\n")
         for check, result in health_status['checks'].items():
             status = "✓ PASS" if result else "✗ FAIL"
-            print(f"  {check}: {status}")
+            parts.append(f"  {check}: {status}\n")
         
         # SMA Configuration
         sma_config = device.get_sma_configuration()
-        print("\nSMA Configuration:")
-        print("  Inputs:")
+        parts.append("\nSMA Configuration:\n")
+        parts.append("  Inputs:\n")
         for port, signal in sma_config['inputs'].items():
-            print(f"    {port}: {signal}")
-        print("  Outputs:")
+            parts.append(f"    {port}: {signal}\n")
+        parts.append("  Outputs:\n")
         for port, signal in sma_config['outputs'].items():
-            print(f"    {port}: {signal}")
+            parts.append(f"    {port}: {signal}\n")
+        
+        sys.stdout.buffer.write(''.join(parts).encode('utf-8'))
+        sys.stdout.buffer.flush()
+        
+        return device, status_reader
             
     except DeviceNotFoundError:
         print("ERROR: QUANTUM-PCI device not found")
@@ -264,13 +294,13 @@ Examples:
     setup_logging(args.log_level)
     
     if args.cli:
-        run_cli_mode(args.device)
+        ctx = run_cli_mode(args.device)
         
-        # Экспорт статуса если указан
-        if args.export:
+        # Экспорт статуса если указан; устройство и считыватель уже
+        # созданы в run_cli_mode — повторный поиск не нужен
+        if args.export and ctx:
             try:
-                device = QuantumPCIDevice(args.device)
-                status_reader = StatusReader(device)
+                _, status_reader = ctx
                 format_type = "csv" if args.export.endswith(".csv") else "json"
                 
                 if status_reader.export_status(args.export, format_type):
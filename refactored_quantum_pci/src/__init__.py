@@ -6,12 +6,26 @@ QUANTUM-PCI Refactored Package
 __version__ = "2.0.0"
 __author__ = "QUANTUM-PCI Development Team"
 
-from .core.device import QuantumPCIDevice
-from .core.config_manager import ConfigManager
-from .api.status_reader import StatusReader
-
 __all__ = [
     "QuantumPCIDevice",
     "ConfigManager", 
     "StatusReader"
-]
\ No newline at end of file
+]
+
+# Ленивые импорты (PEP 562): подмодули загружаются при первом
+# обращении, чтобы режим --cli не тянул лишние зависимости
+_LAZY_IMPORTS = {
+    "QuantumPCIDevice": ".core.device",
+    "ConfigManager": ".core.config_manager",
+    "StatusReader": ".api.status_reader",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
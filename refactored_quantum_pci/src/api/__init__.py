@@ -2,8 +2,20 @@
 API модуль для работы с QUANTUM-PCI устройствами
 """
 
-from .status_reader import StatusReader
-
 __all__ = [
     "StatusReader"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # Ленивый импорт (PEP 562): web_api тянет FastAPI/uvicorn и не
+    # должен загружаться, пока не запрошен явно
+    if name == "StatusReader":
+        from .status_reader import StatusReader
+        globals()[name] = StatusReader
+        return StatusReader
+    if name == "QuantumPCIWebAPI":
+        from .web_api import QuantumPCIWebAPI
+        globals()[name] = QuantumPCIWebAPI
+        return QuantumPCIWebAPI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,36 +2,30 @@
 Рефакторированный модуль для чтения статусов QUANTUM-PCI устройства
 """
 
+import asyncio
+import os
+import queue
 import time
 import json
-import signal
 import subprocess
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Callable
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pathlib import Path
 from contextlib import contextmanager
 
 from ..core.device import QuantumPCIDevice
 from ..core.exceptions import QuantumPCIError
 
-
-@contextmanager
-def timeout(duration):
-    """Контекстный менеджер для операций с timeout"""
-    def timeout_handler(signum, frame):
-        raise TimeoutError(f"Operation timed out after {duration} seconds")
-    
-    # Сохраняем старый обработчик
-    old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-    signal.alarm(duration)
-    
-    try:
-        yield
-    finally:
-        signal.alarm(0)
-        signal.signal(signal.SIGALRM, old_handler)
+# orjson опционален: C-сериализатор для экспорта, при отсутствии
+# используется стандартный json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 @contextmanager
@@ -87,6 +81,24 @@ def safe_run_command(command, timeout_sec=30, show_error=True):
         return None
 
 
+def _try_parse_float(value: Optional[str]) -> Optional[float]:
+    """Разбор числового значения sysfs без исключений
+    
+    Пустые и нечисловые строки — штатный случай для неинициализи-
+    рованных атрибутов; проверка первого символа отсекает их до
+    вызова float() и не платит за создание ValueError на каждом тике.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if not value or not (value[0] == '-' or value[0].isdigit()):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
 class StatusReader:
     """Класс для чтения и мониторинга статусов QUANTUM-PCI устройства"""
     
@@ -113,6 +125,13 @@ class StatusReader:
 
     }
     
+    # Дополнительные атрибуты расширенного статуса часов — читаются
+    # одной пачкой через кэш дескрипторов устройства
+    _CLOCK_EXTRA_ATTRS = (
+        'utc_tai_offset', 'internal_pps_cable_delay',
+        'external_pps_cable_delay', 'irig_b_mode'
+    )
+    
     def __init__(self, device: Optional[QuantumPCIDevice] = None, logger: Optional[logging.Logger] = None):
         """
         Инициализация StatusReader
@@ -125,13 +144,39 @@ class StatusReader:
         self.device = device or QuantumPCIDevice(logger=self.logger)
         self._monitoring_active = False
         self._monitoring_thread = None
+        # Слоты callback: прямой атрибут вместо двух словарных
+        # обращений на каждый вызов в цикле
+        self._cb_status = None
+        self._cb_error = None
+        self._cb_clock = None
+        self._cb_gnss = None
+        self._cb_health = None
+        # Очередь доставки callback: поток опроса только публикует
+        # события, медленный потребитель не искажает период выборки
+        self._cb_queue = None
+        self._cb_thread = None
+        # Общий пул для независимых пачек sysfs-чтений: pread блокируется
+        # в ядре с отпущенным GIL, поэтому пачки реально перекрываются
+        self._pool = ThreadPoolExecutor(max_workers=4)
+        # Отдельный одиночный исполнитель для чтений статуса с timeout:
+        # future.result(timeout) работает из любого потока, в отличие
+        # от SIGALRM
+        self._status_exec = ThreadPoolExecutor(max_workers=1)
         self._callbacks = {}
         self._stop_flag = False
         self._stop_monitoring = False
         
-        # Кэш для доступных атрибутов
+        # Кэши разделов, зависящих только от топологии sysfs: она
+        # статична после загрузки драйвера, поэтому инвалидация — по
+        # mtime каталога устройства (один stat на обращение), а не по
+        # таймеру
         self._available_attributes = None
-        self._last_scan_time = None
+        self._scan_mtime = None
+        self._caps_cache = None
+        self._caps_mtime = None
+        # Имена файлов каталога устройства из одного scandir —
+        # вместо пары stat на каждый кандидатный атрибут
+        self._dir_entries = None
         
     def scan_available_attributes(self, force_rescan: bool = False) -> Dict[str, List[str]]:
         """
@@ -143,11 +188,10 @@ class StatusReader:
         Returns:
             Словарь с доступными атрибутами по категориям
         """
-        # Проверяем кэш (обновляем каждые 60 секунд)
-        current_time = time.time()
-        if (not force_rescan and self._available_attributes is not None and 
-            self._last_scan_time is not None and 
-            current_time - self._last_scan_time < 60):
+        # Кэш действителен, пока не изменился mtime каталога устройства
+        dir_mtime = self._device_dir_mtime()
+        if (not force_rescan and self._available_attributes is not None and
+                dir_mtime is not None and dir_mtime == self._scan_mtime):
             return self._available_attributes
         
         available = {
@@ -161,26 +205,29 @@ class StatusReader:
             self.logger.warning("Device not available for attribute scanning")
             return available
         
+        self._dir_entries = None  # перечитываем каталог заново
+        exists = self._check_attribute_exists
+        
         # Сканирование основных атрибутов
         for attr in self.ALL_DEVICE_ATTRIBUTES['basic']:
-            if self._check_attribute_exists(attr):
+            if exists(attr):
                 available['basic'].append(attr)
         
         # Сканирование SMA атрибутов
         for attr in self.ALL_DEVICE_ATTRIBUTES['sma']:
-            if self._check_attribute_exists(attr):
+            if exists(attr):
                 available['sma'].append(attr)
         
         # Сканирование TOD атрибутов
         for attr in self.ALL_DEVICE_ATTRIBUTES['tod']:
-            if self._check_attribute_exists(attr):
+            if exists(attr):
                 available['tod'].append(attr)
         
 
         
         # Сохранение в кэш
         self._available_attributes = available
-        self._last_scan_time = current_time
+        self._scan_mtime = dir_mtime
         
         # Логирование результатов
         total_attrs = (len(available['basic']) + len(available['sma']) + 
@@ -189,20 +236,44 @@ class StatusReader:
         
         return available
     
-    def _check_attribute_exists(self, attr_name: str) -> bool:
-        """Проверка существования атрибута на устройстве"""
+    def _device_dir_mtime(self) -> Optional[int]:
+        """st_mtime_ns каталога устройства; None, если он недоступен"""
         try:
-            attr_path = self.device.device_path / attr_name
-            return attr_path.exists() and attr_path.is_file()
-        except Exception as e:
-            self.logger.debug(f"Error checking attribute {attr_name}: {e}")
-            return False
+            return self.device.device_path.stat().st_mtime_ns
+        except (OSError, AttributeError):
+            return None
+    
+    def _check_attribute_exists(self, attr_name: str) -> bool:
+        """Проверка существования атрибута на устройстве
+        
+        Каталог устройства перечисляется одним scandir (d_type из
+        getdents делает is_file бесплатным), дальше проверки — поиск
+        в множестве без новых syscall.
+        """
+        if self._dir_entries is None:
+            try:
+                with os.scandir(self.device.device_path) as it:
+                    self._dir_entries = frozenset(
+                        entry.name for entry in it
+                        if entry.is_file(follow_symlinks=False))
+            except OSError as e:
+                self.logger.debug(f"Error scanning device directory: {e}")
+                self._dir_entries = frozenset()
+        return attr_name in self._dir_entries
     
     def get_device_capabilities(self) -> Dict[str, bool]:
         """
         Определение доступных возможностей устройства
         на основе наличия соответствующих директорий/файлов
         """
+        dir_mtime = self._device_dir_mtime()
+        if (self._caps_cache is not None and dir_mtime is not None
+                and dir_mtime == self._caps_mtime):
+            return self._caps_cache
+
+        # Каталог изменился — перечитываем и перечень его файлов
+        self._dir_entries = None
+
         capabilities = {
             "basic": True,  # Базовые функции всегда доступны
             "irig": False,
@@ -210,37 +281,56 @@ class StatusReader:
         }
         
         try:
-
-            
             # Проверка IRIG-B
-            irig_file = self.device.device_path / "irig_b_mode"
-            if irig_file.exists():
-                capabilities["irig"] = True
+            capabilities["irig"] = self._check_attribute_exists("irig_b_mode")
             
             # Проверка TOD (Time of Day)
-            tod_file = self.device.device_path / "tod_protocol"
-            if tod_file.exists():
-                capabilities["tod"] = True
+            capabilities["tod"] = self._check_attribute_exists("tod_protocol")
                 
         except Exception as e:
             self.logger.error(f"Error checking device capabilities: {e}")
         
+        self._caps_cache = capabilities
+        self._caps_mtime = dir_mtime
+        
         return capabilities
 
-    def get_full_status(self) -> Dict[str, Any]:
-        """Получение полного статуса устройства со всеми доступными параметрами"""
+    def get_full_status(self, include_health: bool = True) -> Dict[str, Any]:
+        """Получение полного статуса устройства со всеми доступными параметрами
+        
+        Args:
+            include_health: Выполнять ли проверки состояния; потребители,
+                которым раздел health_status не нужен, экономят его
+                sysfs-чтения
+        """
+        # Одна метка времени на весь снимок: вложенные разделы не
+        # форматируют каждый свою. Численный timestamp_ns — для
+        # потребителей, которым строка ISO не нужна
+        ts_ns = time.time_ns()
+        ts = datetime.fromtimestamp(ts_ns / 1e9).isoformat()
+        
+        # Независимые разделы снимка читаются параллельно через пул
+        info_f = self._pool.submit(self.device.get_device_info, ts)
+        clock_f = self._pool.submit(self.device.get_clock_status, ts)
+        sma_f = self._pool.submit(self.device.get_sma_configuration, ts)
+        checks_f = (self._pool.submit(self._perform_health_checks)
+                    if include_health else None)
+        
         status = {
-            "timestamp": datetime.now().isoformat(),
-            "device_info": self.device.get_device_info(),
+            "timestamp": ts,
+            "timestamp_ns": ts_ns,
+            "device_info": info_f.result(),
             "device_capabilities": self.get_device_capabilities(),
             "available_attributes": self.scan_available_attributes(),
-            "clock_status": self.device.get_clock_status(),
-            "sma_configuration": self.device.get_sma_configuration(),
-            "health_status": {
+            "clock_status": clock_f.result(),
+            "sma_configuration": sma_f.result(),
+        }
+        
+        if checks_f is not None:
+            status["health_status"] = {
                 "healthy": self.device.is_healthy(),
-                "checks": self._perform_health_checks()
+                "checks": checks_f.result()
             }
-        }
         
         # Добавляем все доступные основные атрибуты
         basic_attributes = self._get_all_basic_attributes()
@@ -260,15 +350,16 @@ class StatusReader:
         """Получение расширенного статуса часов"""
         base_status = self.device.get_clock_status()
         
-        # Добавление дополнительной информации
+        # Добавление дополнительной информации одной пачкой чтений
+        extra = self.device.read_device_files(self._CLOCK_EXTRA_ATTRS)
         extended_status = {
             **base_status,
             "source": self.device.get_current_clock_source(),
             "available_sources": self.device.get_available_clock_sources(),
-            "utc_tai_offset": self.device.read_device_file("utc_tai_offset"),
-            "internal_pps_delay": self.device.read_device_file("internal_pps_cable_delay"),
-            "external_pps_delay": self.device.read_device_file("external_pps_cable_delay"),
-            "irig_mode": self.device.read_device_file("irig_b_mode")
+            "utc_tai_offset": extra["utc_tai_offset"],
+            "internal_pps_delay": extra["internal_pps_cable_delay"],
+            "external_pps_delay": extra["external_pps_cable_delay"],
+            "irig_mode": extra["irig_b_mode"]
         }
         
         return extended_status
@@ -278,14 +369,15 @@ class StatusReader:
         attributes = {}
         available = self.scan_available_attributes()
         
-        for attr in available.get('basic', []):
-            try:
-                value = self.device.read_device_file(attr)
-                if value is not None:
-                    attributes[attr] = value
-            except Exception as e:
-                self.logger.warning(f"Error reading basic attribute {attr}: {e}")
-                attributes[attr] = f"ERROR: {e}"
+        try:
+            names = available.get('basic', [])
+            # Чтения независимы: пул перекрывает их preadv, пока GIL
+            # отпущен в ядре
+            values = self._pool.map(self.device.read_device_file, names)
+            attributes = {attr: value for attr, value in zip(names, values)
+                          if value is not None}
+        except Exception as e:
+            self.logger.warning(f"Error reading basic attributes: {e}")
         
         return attributes
     
@@ -294,14 +386,13 @@ class StatusReader:
         attributes = {}
         available = self.scan_available_attributes()
         
-        for attr in available.get('tod', []):
-            try:
-                value = self.device.read_device_file(attr)
-                if value is not None:
-                    attributes[attr] = value
-            except Exception as e:
-                self.logger.warning(f"Error reading TOD attribute {attr}: {e}")
-                attributes[attr] = f"ERROR: {e}"
+        try:
+            names = available.get('tod', [])
+            values = self._pool.map(self.device.read_device_file, names)
+            attributes = {attr: value for attr, value in zip(names, values)
+                          if value is not None}
+        except Exception as e:
+            self.logger.warning(f"Error reading TOD attributes: {e}")
         
         return attributes
     
@@ -314,6 +405,17 @@ class StatusReader:
         try:
             # Проверка базовых параметров
             checks["device_accessible"] = self.device.device_path.exists()
+            if not checks["device_accessible"]:
+                # Устройство пропало — дальнейшие чтения только
+                # плодят неудачные open и шум в логах
+                checks.update({
+                    "serial_readable": False,
+                    "gnss_synchronized": False,
+                    "clock_source_set": False,
+                    "clock_drift_acceptable": None,
+                })
+                return checks
+            
             checks["serial_readable"] = self.device.read_device_file("serialnum") is not None
             
             # Проверка синхронизации
@@ -327,12 +429,11 @@ class StatusReader:
             
             # Проверка дрейфа часов
             drift = self.device.read_device_file("clock_status_drift")
-            if drift:
-                try:
-                    drift_value = float(drift)
-                    checks["clock_drift_acceptable"] = abs(drift_value) < 1000  # Пример порога
-                except ValueError:
-                    checks["clock_drift_acceptable"] = False
+            drift_value = _try_parse_float(drift)
+            if drift_value is not None:
+                checks["clock_drift_acceptable"] = abs(drift_value) < 1000  # Пример порога
+            elif drift:
+                checks["clock_drift_acceptable"] = False
             else:
                 checks["clock_drift_acceptable"] = None
             
@@ -354,8 +455,14 @@ class StatusReader:
             self.logger.warning("Monitoring already active")
             return
         
-        self._callbacks = callbacks or {}
+        self._bind_callbacks(callbacks)
         self._monitoring_active = True
+        self._cb_queue = queue.SimpleQueue()
+        self._cb_thread = threading.Thread(
+            target=self._callback_loop,
+            daemon=True
+        )
+        self._cb_thread.start()
         self._monitoring_thread = threading.Thread(
             target=self._monitoring_loop,
             args=(interval,),
@@ -364,6 +471,90 @@ class StatusReader:
         self._monitoring_thread.start()
         self.logger.info("Status monitoring started")
     
+    def _bind_callbacks(self, callbacks: Optional[Dict[str, Callable]]):
+        """Раскладка словаря callback по слотам-атрибутам"""
+        self._callbacks = callbacks or {}
+        self._cb_status = self._callbacks.get("on_status_update")
+        self._cb_error = self._callbacks.get("on_error")
+        self._cb_clock = self._callbacks.get("on_clock_source_change")
+        self._cb_gnss = self._callbacks.get("on_gnss_status_change")
+        self._cb_health = self._callbacks.get("on_health_change")
+    
+    def start_monitoring_async(self, interval: float = 1.0,
+                               callbacks: Optional[Dict[str, Callable]] = None):
+        """
+        Запуск мониторинга как asyncio-задачи
+        
+        Вариант для asyncio-приложений (веб API): блокирующие sysfs-
+        чтения уходят в поток через asyncio.to_thread, пауза между
+        тиками — asyncio.sleep по дедлайну, и цикл событий не
+        блокируется. Контракт callback тот же, что у start_monitoring;
+        корутинные callback ожидаются прямо в цикле.
+        
+        Args:
+            interval: Интервал обновления в секундах
+            callbacks: Словарь callback функций для различных событий
+            
+        Returns:
+            asyncio.Task цикла мониторинга или None, если уже запущен
+        """
+        if self._monitoring_active:
+            self.logger.warning("Monitoring already active")
+            return None
+        
+        self._bind_callbacks(callbacks)
+        self._monitoring_active = True
+        self._stop_flag = False
+        task = asyncio.create_task(self._async_monitoring_loop(interval))
+        self.logger.info("Async status monitoring started")
+        return task
+    
+    async def _async_monitoring_loop(self, interval: float):
+        """Асинхронный аналог _monitoring_loop"""
+        if interval < 0.1:
+            interval = 0.1
+        elif interval > 3600:
+            interval = 3600
+        
+        loop = asyncio.get_running_loop()
+        last_signals = (None, None, None)
+        next_deadline = loop.time() + interval
+        
+        while self._monitoring_active and not self._stop_flag:
+            try:
+                if self._cb_status is not None:
+                    current_status = await asyncio.to_thread(self.get_full_status)
+                    result = self._cb_status(current_status)
+                    if asyncio.iscoroutine(result):
+                        await result
+                    new_signals = self._extract_signals(current_status)
+                else:
+                    new_signals = await asyncio.to_thread(self._read_signals)
+                
+                self._check_status_changes(last_signals, new_signals)
+                last_signals = new_signals
+                
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(f"Error in async monitoring loop: {e}")
+                if self._cb_error is not None:
+                    self._cb_error(e)
+            
+            sleep_for = next_deadline - loop.time()
+            if sleep_for < -interval:
+                next_deadline = loop.time() + interval
+                sleep_for = interval
+            if sleep_for > 0:
+                try:
+                    await asyncio.sleep(sleep_for)
+                except asyncio.CancelledError:
+                    break
+            next_deadline += interval
+        
+        self._monitoring_active = False
+        self.logger.info("Async status monitoring loop completed")
+    
     def stop_monitoring(self):
         """Безопасная остановка всех процессов мониторинга"""
         
@@ -384,14 +575,42 @@ class StatusReader:
             else:
                 self.logger.info("Monitoring thread stopped successfully")
         
+        # Останавливаем поток доставки callback, добрав очередь
+        if self._cb_queue is not None:
+            self._cb_queue.put(None)
+            if self._cb_thread is not None and self._cb_thread.is_alive():
+                self._cb_thread.join(timeout=2.0)
+            self._cb_queue = None
+            self._cb_thread = None
+        
+        # Дескрипторы sysfs-атрибутов больше не нужны
+        self.device.close_cached_files()
+        
         self.logger.info("Status monitoring stopped")
     
     def _monitoring_loop(self, interval: float):
         """Безопасная версия _monitoring_loop с защитой от зависания"""
-        last_status = {}
+        # Для детектора изменений достаточно трех скалярных полей —
+        # полный снимок предыдущего тика не удерживается
+        last_signals = (None, None, None)
         iteration_count = 0
         max_iterations = 86400  # Максимум 24 часа при интервале 1 сек
         
+        # Ограничиваем интервал
+        if interval < 0.1:  # Минимум 100мс
+            interval = 0.1
+        elif interval > 3600:  # Максимум 1 час
+            interval = 3600
+        
+        # Планирование по дедлайну: пауза компенсирует длительность
+        # get_full_status, и фактическая частота опроса не дрейфует.
+        # Интервал адаптивный: после серии тиков без изменений он
+        # удваивается до 10x и сбрасывается при первом же изменении
+        cur_interval = interval
+        max_interval = interval * 10
+        idle_count = 0
+        next_deadline = time.monotonic() + interval
+        
         self.logger.info("Starting safe status monitoring loop...")
         
         while (self._monitoring_active and 
@@ -401,85 +620,128 @@ class StatusReader:
             iteration_count += 1
             
             try:
-                # Ограничиваем интервал
-                if interval < 0.1:  # Минимум 100мс
-                    interval = 0.1
-                elif interval > 3600:  # Максимум 1 час
-                    interval = 3600
-                
                 # Получение статуса с timeout
                 try:
                     # Используем простой timeout без сигналов для потокобезопасности
                     start_time = time.time()
-                    current_status = self.get_full_status()
-                    elapsed = time.time() - start_time
                     
+                    if self._cb_status is not None:
+                        current_status = self.get_full_status()
+                        self._cb_queue.put(("status", current_status))
+                        new_signals = self._extract_signals(current_status)
+                    else:
+                        # Подписаны только детекторы изменений: полный
+                        # снимок из ~40 чтений не нужен, хватает трех
+                        # отслеживаемых полей
+                        new_signals = self._read_signals()
+                    
+                    elapsed = time.time() - start_time
                     if elapsed > 10:  # Если операция заняла больше 10 секунд
                         self.logger.warning(f"Status read took {elapsed:.2f} seconds")
                     
-                    # Вызов callback для полного статуса
-                    if "on_status_update" in self._callbacks:
-                        self._callbacks["on_status_update"](current_status)
-                    
-                    # Проверка изменений и вызов соответствующих callback
-                    self._check_status_changes(last_status, current_status)
+                    # Изменения сигналов уходят потребителю очереди
+                    if new_signals != last_signals:
+                        self._cb_queue.put(("signals", last_signals, new_signals))
+                        idle_count = 0
+                        cur_interval = interval
+                    else:
+                        idle_count += 1
+                        if idle_count > 4:
+                            cur_interval = min(cur_interval * 2, max_interval)
                     
-                    last_status = current_status
+                    last_signals = new_signals
                     
                 except TimeoutError:
                     self.logger.warning(f"Status read timed out at iteration {iteration_count}")
-                    if "on_error" in self._callbacks:
-                        self._callbacks["on_error"](TimeoutError("Status read timeout"))
+                    self._cb_queue.put(("error", TimeoutError("Status read timeout")))
                 
-                # Безопасная пауза
+                # Безопасная пауза до дедлайна
+                sleep_for = next_deadline - time.monotonic()
+                if sleep_for < -cur_interval:
+                    # Сильно отстали — ресинхронизация вместо лавины
+                    # догоняющих итераций
+                    self.logger.warning(
+                        f"Monitoring falling behind by {-sleep_for:.2f}s, resyncing")
+                    next_deadline = time.monotonic() + cur_interval
+                    sleep_for = cur_interval
                 try:
-                    time.sleep(interval)
+                    if sleep_for > 0:
+                        time.sleep(sleep_for)
                 except KeyboardInterrupt:
                     self.logger.info("Monitoring interrupted by user")
                     break
+                next_deadline += cur_interval
                     
             except Exception as e:
                 self.logger.error(f"Error in monitoring loop iteration {iteration_count}: {e}")
-                if "on_error" in self._callbacks:
-                    self._callbacks["on_error"](e)
+                self._cb_queue.put(("error", e))
                 time.sleep(1.0)  # Пауза при ошибке
+                next_deadline = time.monotonic() + cur_interval
                 
         self.logger.info(f"Status monitoring loop completed after {iteration_count} iterations")
     
-    def _check_status_changes(self, old_status: Dict[str, Any], new_status: Dict[str, Any]):
-        """Проверка изменений статуса и вызов соответствующих callback"""
+    @staticmethod
+    def _extract_signals(status: Dict[str, Any]) -> tuple:
+        """Три отслеживаемых скаляра из полного снимка статуса"""
+        clock_status = status.get("clock_status", {})
+        return (
+            clock_status.get("source")
+            or status.get("device_info", {}).get("current_clock_source"),
+            clock_status.get("gnss_sync"),
+            status.get("health_status", {}).get("healthy"),
+        )
+    
+    def _read_signals(self) -> tuple:
+        """Чтение только отслеживаемых полей без полного снимка"""
+        values = self.device.read_device_files(("clock_source", "gnss_sync"))
+        return (
+            values.get("clock_source"),
+            values.get("gnss_sync"),
+            self.device.is_healthy(),
+        )
+    
+    def _callback_loop(self):
+        """Поток доставки callback: разбор очереди событий мониторинга"""
+        while True:
+            event = self._cb_queue.get()
+            if event is None:
+                break
+            try:
+                kind = event[0]
+                if kind == "status":
+                    if self._cb_status is not None:
+                        self._cb_status(event[1])
+                elif kind == "signals":
+                    self._check_status_changes(event[1], event[2])
+                elif kind == "error":
+                    if self._cb_error is not None:
+                        self._cb_error(event[1])
+            except Exception as e:
+                self.logger.error(f"Error delivering callback: {e}")
+    
+    def _check_status_changes(self, old_signals: tuple, new_signals: tuple):
+        """Сравнение кортежей сигналов и вызов callback по изменениям"""
+        if old_signals == new_signals:
+            return
         try:
-            # Проверка изменения источника синхронизации
-            old_clock_source = old_status.get("clock_status", {}).get("source")
-            new_clock_source = new_status.get("clock_status", {}).get("source")
-            
-            if old_clock_source != new_clock_source and "on_clock_source_change" in self._callbacks:
-                self._callbacks["on_clock_source_change"](old_clock_source, new_clock_source)
-            
-            # Проверка изменения статуса GNSS
-            old_gnss = old_status.get("clock_status", {}).get("gnss_sync")
-            new_gnss = new_status.get("clock_status", {}).get("gnss_sync")
-            
-            if old_gnss != new_gnss and "on_gnss_status_change" in self._callbacks:
-                self._callbacks["on_gnss_status_change"](old_gnss, new_gnss)
-            
-            # Проверка изменения состояния здоровья
-            old_health = old_status.get("health_status", {}).get("healthy")
-            new_health = new_status.get("health_status", {}).get("healthy")
-            
-            if old_health != new_health and "on_health_change" in self._callbacks:
-                self._callbacks["on_health_change"](old_health, new_health)
-                
+            callbacks = (self._cb_clock, self._cb_gnss, self._cb_health)
+            for callback, old_value, new_value in zip(
+                    callbacks, old_signals, new_signals):
+                if old_value != new_value and callback is not None:
+                    callback(old_value, new_value)
         except Exception as e:
             self.logger.error(f"Error checking status changes: {e}")
     
-    def export_status(self, output_file: str, format: str = "json") -> bool:
+    def export_status(self, output_file: str, format: str = "json",
+                      pretty: bool = False) -> bool:
         """
         Экспорт текущего статуса в файл
         
         Args:
             output_file: Путь к выходному файлу
             format: Формат экспорта ("json" или "csv")
+            pretty: Отступы в JSON; по умолчанию компактный вывод,
+                форматирование — по явному запросу
             
         Returns:
             True при успехе
@@ -489,33 +751,41 @@ class StatusReader:
             output_path = Path(output_file)
             
             if format.lower() == "json":
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(status, f, indent=4, ensure_ascii=False)
+                if orjson is not None:
+                    option = orjson.OPT_INDENT_2 if pretty else 0
+                    with open(output_path, 'wb') as f:
+                        f.write(orjson.dumps(status, option=option))
+                elif pretty:
+                    with open(output_path, 'w', encoding='utf-8') as f:
+                        json.dump(status, f, indent=4, ensure_ascii=False)
+                else:
+                    with open(output_path, 'w', encoding='utf-8') as f:
+                        json.dump(status, f, separators=(",", ":"),
+                                  ensure_ascii=False)
                     
             elif format.lower() == "csv":
                 import csv
-                # Упрощенный экспорт основных параметров в CSV
+                # Упрощенный экспорт основных параметров в CSV:
+                # строки собираются заранее и пишутся одним writerows
+                device_info = status.get("device_info", {})
+                clock_status = status.get("clock_status", {})
+                sma_config = status.get("sma_configuration", {})
+                
+                rows = [
+                    ("Parameter", "Value"),
+                    ("Serial Number", device_info.get("serial_number")),
+                    ("Clock Source", device_info.get("current_clock_source")),
+                    ("GNSS Sync", device_info.get("gnss_sync")),
+                    ("Clock Drift", clock_status.get("drift")),
+                    ("Clock Offset", clock_status.get("offset")),
+                ]
+                rows.extend((f"SMA {port} Input", value)
+                            for port, value in sma_config.get("inputs", {}).items())
+                rows.extend((f"SMA {port} Output", value)
+                            for port, value in sma_config.get("outputs", {}).items())
+                
                 with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(["Parameter", "Value"])
-                    
-                    # Основная информация
-                    device_info = status.get("device_info", {})
-                    writer.writerow(["Serial Number", device_info.get("serial_number")])
-                    writer.writerow(["Clock Source", device_info.get("current_clock_source")])
-                    writer.writerow(["GNSS Sync", device_info.get("gnss_sync")])
-                    
-                    # Статус часов
-                    clock_status = status.get("clock_status", {})
-                    writer.writerow(["Clock Drift", clock_status.get("drift")])
-                    writer.writerow(["Clock Offset", clock_status.get("offset")])
-                    
-                    # SMA конфигурация
-                    sma_config = status.get("sma_configuration", {})
-                    for port, value in sma_config.get("inputs", {}).items():
-                        writer.writerow([f"SMA {port} Input", value])
-                    for port, value in sma_config.get("outputs", {}).items():
-                        writer.writerow([f"SMA {port} Output", value])
+                    csv.writer(f, quoting=csv.QUOTE_MINIMAL).writerows(rows)
             else:
                 raise ValueError(f"Unsupported format: {format}")
             
@@ -561,9 +831,10 @@ class StatusReader:
                     self.logger.info(f"Iteration {iteration_count}/{max_iterations}")
                 
                 try:
-                    # Получение статуса с timeout
-                    with timeout(10):  # 10 секунд timeout
-                        status = self.get_full_status()
+                    # Получение статуса с timeout через future: без
+                    # SIGALRM и процесс-глобального состояния
+                    status = self._status_exec.submit(
+                        self.get_full_status).result(timeout=10)
                     
                     # Вывод статуса
                     if format_type == "json":
@@ -580,7 +851,7 @@ class StatusReader:
                     else:
                         self.logger.info(f"[{time.strftime('%H:%M:%S')}] Status updated")
                         
-                except TimeoutError:
+                except FutureTimeoutError:
                     self.logger.warning(f"Warning: Status read timed out at iteration {iteration_count}")
                     
                 except Exception as e:
@@ -5,6 +5,7 @@
 import os
 import signal
 import subprocess
+import threading
 import time
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
@@ -26,6 +27,12 @@ def timeout(duration):
 class QuantumPCIDevice:
     """Класс для работы с QUANTUM-PCI устройством"""
     
+    # Имена SMA-атрибутов вычислены один раз: в цикле опроса не
+    # пересобираются списки и не форматируются f-строки
+    _SMA_INPUT_FILES = tuple(f"sma{i}" for i in range(1, 5))
+    _SMA_OUTPUT_FILES = tuple(f"sma{i}_out" for i in range(1, 5))
+    _SMA_ALL_FILES = _SMA_INPUT_FILES + _SMA_OUTPUT_FILES
+    
     def __init__(self, device_path: Optional[str] = None, logger: Optional[logging.Logger] = None):
         """
         Инициализация устройства
@@ -36,6 +43,14 @@ class QuantumPCIDevice:
         """
         self.logger = logger or logging.getLogger(__name__)
         self.device_path = self._find_device_path(device_path)
+        # Кэш дескрипторов атрибутов: файл открывается один раз, далее
+        # каждое чтение — один pread со смещения 0 (sysfs заново
+        # вызывает show() драйвера). None означает, что атрибута нет —
+        # повторные обращения не тратят syscall на неудачный open
+        self._fd_cache: Dict[str, Optional[int]] = {}
+        # Буфер чтения переиспользуется между вызовами; по буферу на
+        # поток, так как пачки читаются параллельно из пула
+        self._local = threading.local()
         self._validate_device()
         
     def _find_device_path(self, device_path: Optional[str] = None) -> Path:
@@ -130,52 +145,96 @@ class QuantumPCIDevice:
     
     def read_device_file(self, file_name: str, timeout_sec: int = 5) -> Optional[str]:
         """
-        Безопасное чтение файла устройства с timeout и дополнительными проверками
+        Безопасное чтение файла устройства через кэш дескрипторов
         
         Args:
             file_name: Имя файла для чтения
-            timeout_sec: Таймаут операции в секундах
+            timeout_sec: Таймаут операции в секундах (сохранен для
+                совместимости, чтение sysfs не блокируется)
             
         Returns:
             Содержимое файла или None при ошибке
         """
         try:
-            file_path = self.device_path / file_name
-            
-            # Проверяем существование и доступность файла
-            if not file_path.exists():
-                self.logger.debug(f"File {file_name} does not exist")
-                return None
-                
-            if not file_path.is_file():
-                self.logger.debug(f"Path {file_name} is not a file")
+            fd = self._fd_cache.get(file_name, -1)
+            if fd is None:
+                # Отсутствие атрибута уже запомнено
                 return None
             
-            # Проверяем права доступа на чтение
-            try:
-                # Простая проверка доступности
-                if not os.access(file_path, os.R_OK):
-                    self.logger.warning(f"No read permission for {file_name}")
+            if fd < 0:
+                try:
+                    fd = os.open(str(self.device_path / file_name),
+                                 os.O_RDONLY | os.O_CLOEXEC)
+                except FileNotFoundError:
+                    self.logger.debug(f"File {file_name} does not exist")
+                    self._fd_cache[file_name] = None
                     return None
-            except OSError:
-                self.logger.warning(f"Cannot check permissions for {file_name}")
-                return None
+                except (PermissionError, IsADirectoryError) as e:
+                    self.logger.warning(f"Cannot read {file_name}: {e}")
+                    self._fd_cache[file_name] = None
+                    return None
+                except OSError as e:
+                    self.logger.error(f"Error opening {file_name}: {e}")
+                    return None
+                # setdefault атомарен: при гонке двух потоков лишний
+                # дескриптор закрывается, а не теряется
+                existing = self._fd_cache.setdefault(file_name, fd)
+                if existing != fd:
+                    os.close(fd)
+                    fd = existing
+            
+            buf = getattr(self._local, 'buf', None)
+            if buf is None:
+                buf = self._local.buf = bytearray(4096)
             
-            # Читаем файл простым способом (как в рабочей версии)
             try:
-                with open(file_path, 'r') as f:
-                    content = f.read().strip()
-                    self.logger.debug(f"Read from {file_name}: {content}")
-                    return content
-                    
-            except (OSError, IOError, UnicodeDecodeError) as e:
+                n = os.preadv(fd, (buf,), 0)
+                content = buf[:n].decode('utf-8', 'replace').strip()
+                self.logger.debug(f"Read from {file_name}: {content}")
+                return content
+            except OSError as e:
+                # Дескриптор устарел (устройство перепривязано) —
+                # выбрасываем из кэша, следующий вызов откроет заново
                 self.logger.error(f"Error reading {file_name}: {e}")
+                self._fd_cache.pop(file_name, None)
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
                 return None
                 
         except Exception as e:
             self.logger.error(f"Unexpected error reading {file_name}: {e}")
             return None
     
+    def read_device_files(self, file_names) -> Dict[str, Optional[str]]:
+        """Чтение пачки атрибутов за один проход
+        
+        Все дескрипторы уже зарегистрированы в кэше, поэтому пачка
+        обходится одним циклом pread без повторного построения путей
+        и проверок на каждый атрибут.
+        
+        Args:
+            file_names: Имена файлов для чтения
+            
+        Returns:
+            Словарь имя -> содержимое (None для недоступных)
+        """
+        # Метод связывается один раз вне цикла — без повторного
+        # поиска атрибута на каждый элемент пачки
+        read = self.read_device_file
+        return {name: read(name) for name in file_names}
+    
+    def close_cached_files(self) -> None:
+        """Закрытие всех закэшированных дескрипторов атрибутов"""
+        for fd in self._fd_cache.values():
+            if fd is not None and fd >= 0:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._fd_cache.clear()
+    
     def write_device_file(self, file_name: str, value: str) -> bool:
         """
         Безопасная запись в файл устройства
@@ -201,10 +260,14 @@ class QuantumPCIDevice:
             self.logger.error(f"Error writing to {file_name}: {e}")
             return False
     
-    def get_device_info(self) -> Dict[str, Any]:
-        """Получение информации об устройстве"""
+    def get_device_info(self, ts: Optional[str] = None) -> Dict[str, Any]:
+        """Получение информации об устройстве
+        
+        Args:
+            ts: Готовая метка времени снимка; по умолчанию текущая
+        """
         info = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ts or datetime.now().isoformat(),
             "device_path": str(self.device_path),
             "serial_number": self.read_device_file("serialnum"),
             "available_clock_sources": self.get_available_clock_sources(),
@@ -265,24 +328,23 @@ class QuantumPCIDevice:
         outputs = self.read_device_file("available_sma_outputs")
         return outputs.split() if outputs else []
     
-    def get_sma_configuration(self) -> Dict[str, Any]:
+    def get_sma_configuration(self, ts: Optional[str] = None) -> Dict[str, Any]:
         """Получение конфигурации SMA портов"""
         config = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ts or datetime.now().isoformat(),
             "inputs": {},
             "outputs": {}
         }
         
-        for i in range(1, 5):
-            # SMA входы
-            input_value = self.read_device_file(f"sma{i}")
+        values = self.read_device_files(self._SMA_ALL_FILES)
+        for name, out_name in zip(self._SMA_INPUT_FILES, self._SMA_OUTPUT_FILES):
+            input_value = values[name]
             if input_value is not None:
-                config["inputs"][f"sma{i}"] = input_value
+                config["inputs"][name] = input_value
             
-            # SMA выходы  
-            output_value = self.read_device_file(f"sma{i}_out")
+            output_value = values[out_name]
             if output_value is not None:
-                config["outputs"][f"sma{i}"] = output_value
+                config["outputs"][name] = output_value
         
         return config
     
@@ -373,10 +435,10 @@ class QuantumPCIDevice:
             self.logger.error(f"Failed to apply SMA configuration: {e}")
             return False
     
-    def get_clock_status(self) -> Dict[str, Any]:
+    def get_clock_status(self, ts: Optional[str] = None) -> Dict[str, Any]:
         """Получение статуса часов"""
         status = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": ts or datetime.now().isoformat(),
             "gnss_sync": self.read_device_file("gnss_sync"),
             "drift": self.read_device_file("clock_status_drift"),
             "offset": self.read_device_file("clock_status_offset")
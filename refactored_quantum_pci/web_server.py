@@ -6,7 +6,10 @@
 
 import sys
 import argparse
+import atexit
 import logging
+import logging.handlers
+import queue
 import signal
 import asyncio
 from pathlib import Path
@@ -18,15 +21,28 @@ from src.api.web_api import QuantumPCIWebAPI
 
 
 def setup_logging(level: str = "INFO"):
-    """Настройка логирования"""
+    """Настройка логирования
+
+    Запись в файл идет через QueueHandler/QueueListener: горячий поток
+    только кладет запись в очередь, а write() в файл выполняет фоновый
+    поток слушателя, не задерживая мониторинг и обработку запросов.
+    """
     log_level = getattr(logging, level.upper(), logging.INFO)
     
+    log_queue = queue.Queue(-1)
+    file_handler = logging.FileHandler('quantum_pci_web.log')
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    
     logging.basicConfig(
         level=log_level,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
             logging.StreamHandler(),
-            logging.FileHandler('quantum_pci_web.log')
+            logging.handlers.QueueHandler(log_queue)
         ]
     )
 